@@ -1,7 +1,15 @@
-from .board import Board
+from importlib import import_module
 from .globals import *
-from .properties import Properties
 from .sokoban import Warehouse
-from .builder import Builder
+from .grid import Grid
 
-__all__ = ['board', 'globals', 'properties', 'sokoban', 'builder']
\ No newline at end of file
+# Classes which need tkinter (and PIL) are only imported when first used,
+# so the headless tools (cli, service, terminal) run without them
+_LAZY = {'Board': 'board', 'Properties': 'properties', 'Builder': 'builder'}
+
+def __getattr__(name: str):
+    if name in _LAZY: return getattr(import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# The curses front end (terminal) is left out, curses is not available on Windows
+__all__ = ['board', 'globals', 'properties', 'sokoban', 'builder', 'grid', 'tiles', 'deadlock', 'pathing', 'parsing', 'diff', 'engine', 'cache', 'fixtures', 'canonical', 'watcher', 'scoring', 'npgrid', 'service', 'recording', 'fuzz', 'validate']
@@ -1,34 +1,52 @@
 import tkinter as tk
-from PIL import Image
-from PIL import ImageTk
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Optional
 from components.globals import *
 from components.sokoban import Warehouse
+from components.cache import parse_cache
+from components.deadlock import taboo_cells, find_deadlocks
+from components import npgrid
+
+def tile_image(char: str, size: int = 35, highlight: bool = False):
+    """ Tile images need PIL, so it is only imported once a board is shown (headless boards never are). """
+    from components.tiles import tile_image as load
+    return load(char, size, highlight)
 
 class Board:
     """ 
         Creates a new board instance, which is a 
         modifiable representation of the .txt warehouse.
+        Without a root the board is headless: only the character board
+        is kept (i.e., for fuzzing), no tiles are created or painted.
     """
-    def __init__(self, root: tk.Frame, path: str, 
-                 config=None, side=tk.TOP, text_field=None, build_warehouse_from_array=None) -> None:
-        # Create warehouse instance, either use path, or an existing array
-        self.wh = Warehouse()
-        if build_warehouse_from_array == None: self.wh.load_warehouse(path)
-        else: self.wh.from_lines(build_warehouse_from_array)
+    def __init__(self, root: Optional[tk.Frame], path: str, 
+                 config=None, side=tk.TOP, text_field=None, build_warehouse_from_array=None,
+                 tile_size=35) -> None:
+        # Create warehouse instance, either use path (through the parse cache), or an existing array
+        if build_warehouse_from_array == None: self.wh = parse_cache.load(path)
+        else: self.wh = Warehouse(); self.wh.from_lines(build_warehouse_from_array)
         self.immutable_board = self.board = self.wh.as_array()
-        print(self.wh.worker)
         self.player = None if self.wh.worker is None else (self.wh.worker[1], self.wh.worker[0])
 
         # Save parameters for board visualization 
         self.root = root
-        self.gui = tk.Frame(self.root).pack()
+        self.gui = tk.Frame(self.root).pack() if root != None else None
         self.path = path
         self.config: Dict[str: bool] = config if config != None else {BUTTONS: False, TABOO: False}
         self.side = side
+        self.tile_size = tile_size
         self.tiles = {}
         self.text_field = text_field
-        self.set_gui()
+        self.deadlocked = set()
+        self.highlighted = set()
+        self.pushes = 0
+        self.version = 0 # bumped by every push, undo and reset (never decreases, unlike pushes)
+        self.cost = 0
+        self.show_weights = bool(self.wh.weights)
+        self.box_weights = {(c, r): w for (r, c), w in self.wh.box_weights().items()}
+        self.last_deadlocks = set()
+        self.history = [] # what each move replaced, so it can be undone
+        self.taboo_cells = taboo_cells(self.board) if self.config.get(DEADLOCKS, False) else set()
+        if root != None: self.set_gui()
     
     def set_gui(self) -> None:
         """
@@ -37,20 +55,21 @@ class Board:
             If the configuration has buttons enabled, each of the tiles
             will become buttons, otherwise labels are used to display images. 
         """
-        board = tk.Frame(self.root); board.pack(side=self.side)
+        board = self.frame = tk.Frame(self.root); board.pack(side=self.side)
         for y in range(self.wh.nrows):
             for x in range(self.wh.ncols):
-                img = Image.open(IMAGES[self.board[y][x]])
-                img = img.resize((35,35)); img = ImageTk.PhotoImage(img)
+                img = tile_image(self.board[y][x], self.tile_size)
+                text = self.weight_text((x, y))
                 if self.config[BUTTONS]:
                     # If the config for buttons is enabled, the tiles will
                     # be clickable buttons instead of Labels. Commands can also
                     # be assigned to a mode (i.e., taboo) here.
                     cmd = lambda: print("Nothing assigned to board gui buttons.")
                     if self.config[TABOO]: cmd = lambda x=x, y=y: self.tile_toggled(key=(x, y))
-                    tile = tk.Button(board, image=img, command=cmd,
-                                     highlightthickness = 2, bd = 1)
-                else: tile = tk.Label(board, image=img, borderwidth=0)  
+                    tile = tk.Button(board, image=img, command=cmd, text=text, compound=tk.CENTER,
+                                     font=WEIGHT_FONT, fg="white", highlightthickness = 2, bd = 1)
+                else: tile = tk.Label(board, image=img, borderwidth=0, text=text, compound=tk.CENTER,
+                                      font=WEIGHT_FONT, fg="white")
                 tile.grid(row=y, column=x, sticky=tk.NSEW)
                 self.tiles[(x, y)] = (tile, img, False) # Save tile/image avoid garbage collection.
         if self.config[TABOO]: self.board = self.wh.as_array(walls_only=True)
@@ -68,9 +87,8 @@ class Board:
         c = self.board[y][x] if self.board[y][x] == WALL else BLANK
         button, image, taboo = self.tiles[key]
         if (not taboo and self.immutable_board[y][x] not in INVAILD_TABOO_REPR_CHARS):
-            image = Image.open(IMAGES[X]); c = "X"
-        else: image = Image.open(IMAGES[self.immutable_board[y][x]]) 
-        image = image.resize((35,35)); image = ImageTk.PhotoImage(image)
+            image = tile_image(X, self.tile_size); c = "X"
+        else: image = tile_image(self.immutable_board[y][x], self.tile_size)
         button.config(image=image)
         self.tiles[key] = (button, image, not taboo)
         self.board[y][x] = c
@@ -80,17 +98,40 @@ class Board:
         """
             Attempt to shift the player position tile by a direction vector.
             Return true if the shift is possible, otherwise false.
-            Direction cannot move the tile > 1 cell in any direction (i.e., (0, 1) UP, (-1, 0) LEFT).
+            Direction cannot move the tile > 1 cell in any direction (i.e., (0, -1) UP, (-1, 0) LEFT).
             Impossible moves includes the player tile through a wall, 
             or trying to push a block into another block, or a block into a wall.
         """
-        def image_from_char(char: str) -> ImageTk.PhotoImage:
-            image = Image.open(IMAGES[char])
-            image = image.resize((35,35))
-            return ImageTk.PhotoImage(image)
-        
+        changed = self.shift(direction)
+        if changed == None: return False
+        for cell in changed: self.paint(cell)
+        return True
+
+    def apply_moves(self, directions: List[str]) -> int:
+        """
+            Apply a whole list of direction names (i.e., a planned macro move),
+            then repaint every affected tile once in a single batch.
+            Stops at the first impossible move, and returns how many moves were applied.
+        """
+        changed, deadlocks, applied = set(), set(), 0
+        for d in directions:
+            self.last_deadlocks = set()
+            cells = self.shift(DIRECTIONS[d])
+            if cells == None: break
+            changed.update(cells); deadlocks |= self.last_deadlocks; applied += 1
+        self.last_deadlocks = deadlocks
+        for cell in changed: self.paint(cell)
+        return applied
+
+    def shift(self, direction: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """
+            Apply a single move to the character board only, without repainting.
+            Returns the cells which changed, or None if the move is impossible.
+        """
         shift = lambda pos, delta: (pos[0] + delta[0], pos[1] + delta[1])
-        cell_from_pos = lambda pos: self.board[pos[1]][pos[0]]
+        # Anything outside of the board (i.e., past an open border) behaves as a wall
+        inside = lambda pos: 0 <= pos[1] < len(self.board) and 0 <= pos[0] < len(self.board[pos[1]])
+        cell_from_pos = lambda pos: self.board[pos[1]][pos[0]] if inside(pos) else WALL
         current_cell = cell_from_pos(self.player)
         next_pos = shift(self.player, direction); next_cell = cell_from_pos(next_pos)
 
@@ -104,24 +145,85 @@ class Board:
             # Only if the to be moved box is not obstructed
             next_next_pos = shift(next_pos, direction)
             next_next_cell = cell_from_pos(next_next_pos)
-            if next_next_cell not in [BLANK, TARGET]: return False
+            if next_next_cell not in [BLANK, TARGET]: return None
             procedure = [(self.player, BLANK if current_cell == PLAYER else TARGET), 
                          (next_pos, PLAYER if next_cell in [BLANK, BOX] else PLAYER_ON_TARGET),
                          (next_next_pos, BOX if next_next_cell == BLANK else BOX_ON_TARGET)]
 
         # Running into a wall or any other tile is an illegal move
-        else: return False
+        else: return None
             
-        # Apply procedure
+        # Remember what the procedure replaces, then apply it
+        self.history.append((self.player, [(cell, cell_from_pos(cell)) for cell, _ in procedure],
+                             self.cost, self.pushes, set(self.deadlocked)))
         self.player = next_pos
         for cell, char in procedure:
             x, y = cell; self.board[y][x] = char
-            tkobj, image, taboo = self.tiles[cell]
-            image = image_from_char(char)
-            tkobj.config(image=image, borderwidth=0)
-            self.tiles[cell] = tkobj, image, taboo
+        changed = [cell for cell, _ in procedure]
+        self.cost += 1
+        if len(procedure) == 3: 
+            # The weight follows its box, and pushing costs the weight on top of the move
+            weight = self.box_weights[procedure[2][0]] = self.box_weights.pop(next_pos, 0)
+            self.cost += weight
+            self.pushes += 1
+            self.version += 1
+            if self.config.get(DEADLOCKS, False):
+                changed += self.update_deadlocks(pushed_from=next_pos, pushed_to=procedure[2][0])
+        return changed
+
+    def undo_move(self) -> bool:
+        """
+            Take back the last successful move, restoring the tiles, cost, box weights and deadlocks.
+            Return true if a move was undone, otherwise false (there is nothing to undo).
+        """
+        if not self.history: return False
+        player, cells, self.cost, self.pushes, deadlocked = self.history.pop()
+        self.version += 1
+        if len(cells) == 3: self.box_weights[cells[1][0]] = self.box_weights.pop(cells[2][0], 0)
+        for (x, y), char in cells: self.board[y][x] = char
+        changed = [cell for cell, _ in cells] + list(self.deadlocked ^ deadlocked)
+        self.player, self.deadlocked, self.last_deadlocks = player, deadlocked, set()
+        for cell in changed: self.paint(cell)
         return True
 
+    def update_deadlocks(self, pushed_from: Tuple[int, int], pushed_to: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+            Incrementally checks for deadlocks around a box which was just pushed.
+            Newly deadlocked boxes are stored in self.last_deadlocks and are
+            highlighted on the board until they are moved.
+            Returns the cells which need repainting.
+        """
+        self.deadlocked.discard(pushed_from)
+        self.last_deadlocks = find_deadlocks(self.board, pushed_to, self.taboo_cells) - self.deadlocked
+        self.deadlocked |= self.last_deadlocks
+        return list(self.last_deadlocks)
+
+    def paint(self, cell: Tuple[int, int]) -> None:
+        """ Repaint a single tile from the character board, highlighting deadlocked boxes. """
+        if cell not in self.tiles: return # headless
+        x, y = cell
+        tkobj, _, taboo = self.tiles[cell]
+        highlight = cell in self.deadlocked or cell in self.highlighted
+        image = tile_image(self.board[y][x], self.tile_size, highlight=highlight)
+        tkobj.config(image=image, borderwidth=0, text=self.weight_text(cell))
+        self.tiles[cell] = tkobj, image, taboo
+
+    def weight_text(self, cell: Tuple[int, int]) -> str:
+        """ The weight to show on a tile, if it holds a box of a weighted warehouse. """
+        x, y = cell
+        if not self.show_weights or self.board[y][x] not in (BOX, BOX_ON_TARGET): return ""
+        return str(self.box_weights.get(cell, 0))
+
+    def highlight(self, cells) -> None:
+        """ Highlight the given tiles (i.e., cells which differ), ignoring cells not on the board. """
+        previous, self.highlighted = self.highlighted, {cell for cell in cells if cell in self.tiles}
+        for cell in previous | self.highlighted: self.paint(cell)
+
+    def bind_tiles(self, callback) -> None:
+        """ Calls back with the (x, y) key of any tile which is clicked. """
+        for key, (tkobj, _, _) in self.tiles.items():
+            tkobj.bind("<Button-1>", lambda e, key=key: callback(key))
+
     def update_text_field(self, text: str) -> None:
         """ If text field is provided, delete all contents and replace with given text. """
         if self.text_field != None: 
@@ -131,8 +233,19 @@ class Board:
             self.text_field.config(state=tk.DISABLED)
 
     def reset(self) -> None:
-        """ Reset the board back to original .txt warehouse. """
+        """ Reset the board, player, cost and box weights back to the .txt warehouse (without repainting). """
         self.board = self.wh.as_array()
+        self.player = None if self.wh.worker is None else (self.wh.worker[1], self.wh.worker[0])
+        self.pushes = self.cost = 0
+        self.version += 1
+        self.box_weights = {(c, r): w for (r, c), w in self.wh.box_weights().items()}
+        self.deadlocked, self.last_deadlocks = set(), set()
+        self.history = []
+
+    def as_numpy(self) -> "npgrid.np.ndarray":
+        """ The current board as a (rows, cols) uint8 array, requires numpy (see npgrid.HAS_NUMPY). """
+        if not npgrid.HAS_NUMPY: raise ImportError("numpy is required for Board.as_numpy")
+        return npgrid.from_rows(self.board)
 
     def __str__(self) -> str:
         return "\n".join(["".join(row) for row in self.board])
@@ -1,47 +1,55 @@
 import tkinter as tk
-from tkinter import filedialog
-from PIL import Image
-from PIL import ImageTk
-import time
-from typing import Tuple, List
+from tkinter import filedialog, simpledialog
+from typing import Tuple, List, Set
 from components.globals import *
+from components.grid import Grid
+from components.sokoban import Warehouse
+from components.tiles import tile_image
+
+PAINT_TOOL = 0; RECT_TOOL = 1; FILL_TOOL = 2; PASTE_TOOL = 3
 
 class Builder:
     """ 
         Lets users graphically build Sokoban warehouse,
         and then save the warehouse in string form, or to a text file.
+        The warehouse itself is held in a compact Grid model, the buttons
+        are only a view which is repainted for the cells that changed.
     """
     def __init__(self, root: tk.Tk) -> None:
         self.root = root
         self.buttons = {}
-        self.dimensionality = (8, 8)
+        self.model = Grid(8, 8)
+        self.anchor = None
         self.content = tk.Frame(self.root); self.content.pack(side=tk.LEFT, fill=tk.Y)
         self.grid = tk.Frame(self.content); self.grid.pack(side=tk.TOP)
         self.setup_board()
         self.setup_control_panel()
 
-    def new_tile(self, x: int, y: int, tile: str) -> None:
-        """ Creates and stores a new tile (i.e., blank tile). """
-        img = Image.open(IMAGES[tile])
-        img = img.resize((35,35)); img = ImageTk.PhotoImage(img)
-        button = tk.Button(self.grid, image=img, 
-                            command=lambda x=x, y=y: self.replace_tile(key=(x, y)),
+    @property
+    def dimensionality(self) -> Tuple[int, int]:
+        return (self.model.width, self.model.height)
+
+    def new_tile(self, x: int, y: int) -> None:
+        """ Creates and stores a new tile button, showing whatever the model holds. """
+        button = tk.Button(self.grid, image=tile_image(self.model[x, y]), 
+                            command=lambda x=x, y=y: self.click_tile(key=(x, y)),
                             highlightthickness = 2, bd = 1)
         button.grid(row=y, column=x, sticky=tk.NSEW)
-        self.buttons[(x, y)] = (button, img, BLANK) # Save tile/image avoid garbage collection.
+        self.buttons[(x, y)] = button
 
     def setup_board(self) -> None:
         """ 
             Creates an initial board of size 8x8,
-            or is conformed to the tuple sizing of self.dimensonality.
+            or is conformed to the dimensions of self.model.
         """
-        for y in range(self.dimensionality[1]):
-            for x in range(self.dimensionality[0]):
-                self.new_tile(x, y, BLANK)
+        for y in range(self.model.height):
+            for x in range(self.model.width):
+                self.new_tile(x, y)
 
     def setup_control_panel(self) -> None:
         """ Sets up the additional user controls for creating the warehouse. """
         self.choice = tk.IntVar()
+        self.tool = tk.IntVar()
         panel = tk.Frame(self.root); panel.pack(side=tk.RIGHT, expand=True, fill=tk.Y)
         
         # Display tile options in order of globals.LEGAL_CHARS, 
@@ -57,12 +65,22 @@ class Builder:
         tk.Radiobutton(panel, text="Taboo", variable=self.choice, value=8).pack(side=tk.TOP, anchor=tk.NW)
         self.choice.set(0)
 
+        # Tools decide what clicking on a tile does with the selected tile type
+        tk.Label(panel, text="Tool:").pack(side=tk.TOP, anchor=tk.NW, pady=(10, 0))
+        tk.Radiobutton(panel, text="Paint", variable=self.tool, value=PAINT_TOOL).pack(side=tk.TOP, anchor=tk.NW)
+        tk.Radiobutton(panel, text="Rectangle", variable=self.tool, value=RECT_TOOL).pack(side=tk.TOP, anchor=tk.NW)
+        tk.Radiobutton(panel, text="Flood fill", variable=self.tool, value=FILL_TOOL).pack(side=tk.TOP, anchor=tk.NW)
+        tk.Radiobutton(panel, text="Paste at tile", variable=self.tool, value=PASTE_TOOL).pack(side=tk.TOP, anchor=tk.NW)
+        self.tool.set(PAINT_TOOL)
+
         # Give option for the user to clear all tiles, and copy the board in repr form
         self.status = tk.StringVar(); self.status.set("")
         tk.Button(panel, text="Save Board", command=self.save_board).pack(side=tk.BOTTOM, fill=tk.X)
         tk.Button(panel, text="Copy Board", command=self.copy_board).pack(side=tk.BOTTOM, fill=tk.X)
         tk.Label(panel, text="", textvariable=self.status, bg="white").pack(side=tk.BOTTOM, fill=tk.X)
         tk.Button(panel, text="Clear", command=self.clear).pack(side=tk.BOTTOM, fill=tk.X)
+        tk.Button(panel, text="Wrap Walls", command=self.wrap_walls).pack(side=tk.BOTTOM, fill=tk.X)
+        tk.Button(panel, text="Resize", command=self.ask_resize).pack(side=tk.BOTTOM, fill=tk.X)
 
         # Give option to take or remove columns
         modifiers = tk.Frame(self.content); modifiers.pack(side=tk.BOTTOM, fill=tk.X)
@@ -74,28 +92,69 @@ class Builder:
         tk.Label(modifiers, text=" Column ").pack(side=tk.RIGHT)
         tk.Button(modifiers, text=" ➕ ", command=lambda: self.modify(0, 1)).pack(side=tk.RIGHT)
 
+    def repaint(self, changed: Set[Tuple[int, int]]) -> None:
+        """
+            Brings the buttons in line with the model in one batch.
+            Buttons are created or removed when the model dimensions changed,
+            then only the changed cells are given their (shared) tile image.
+        """
+        for key in [k for k in self.buttons if not self.model.in_bounds(*k)]:
+            self.buttons.pop(key).destroy()
+        for x, y in changed:
+            if (x, y) not in self.buttons: self.new_tile(x, y)
+            else: self.buttons[(x, y)].config(image=tile_image(self.model[x, y]))
+        self.grid.update_idletasks()
+
+    def click_tile(self, key: Tuple[int, int]) -> None:
+        """ Apply the selected tool to the clicked tile. """
+        tool, char = self.tool.get(), LEGAL_CHARS[self.choice.get()]
+        if tool == PAINT_TOOL: self.replace_tile(key)
+        elif tool == FILL_TOOL: self.repaint(self.model.flood_fill(*key, char))
+        elif tool == PASTE_TOOL: self.paste_clipboard(key)
+        elif tool == RECT_TOOL:
+            # First click sets a corner, the second click fills the rectangle
+            if self.anchor == None:
+                self.anchor = key
+                self.buttons[key].config(relief=tk.SUNKEN)
+                return
+            self.buttons[self.anchor].config(relief=tk.RAISED)
+            self.repaint(self.model.fill_rect(*self.anchor, *key, char))
+            self.anchor = None
+
     def replace_tile(self, key: Tuple[int, int]) -> None:
         """ 
             Replace a tile in the grid with whatever tile is selected. 
             If the tile being requested is already the same type of tile,
             assume a request is being made to turn the tile into BLANK.
         """
-        button, img, tile = self.buttons[key]
+        tile = self.model[key]
         tile = (
             BLANK if tile == LEGAL_CHARS[self.choice.get()] 
             else LEGAL_CHARS[self.choice.get()]
         )
-        img = Image.open(IMAGES[tile])
-        img = img.resize((35,35)); img = ImageTk.PhotoImage(img)
-        button.config(image=img)
-        self.buttons[key] = (button, img, tile)
+        self.repaint(self.model.set(*key, tile))
 
     def clear(self) -> None:
         """ Sets all the tiles in the board to BLANK. """
-        for y in range(self.dimensionality[1]):
-            for x in range(self.dimensionality[0]):
-                self.choice.set(0)
-                self.replace_tile(key=(x, y))
+        x, y = self.dimensionality
+        self.repaint(self.model.fill_rect(0, 0, x - 1, y - 1, BLANK))
+
+    def wrap_walls(self) -> None:
+        """ Surround the playable area with walls, growing the board if needed. """
+        self.repaint(self.model.wrap_walls())
+
+    def resize(self, width: int, height: int, dx: int = 0, dy: int = 0) -> None:
+        """ Resize the board to any dimensions of at least 3x3. """
+        if width < 3 or height < 3: return
+        self.anchor = None
+        self.repaint(self.model.resize(width, height, dx, dy))
+
+    def ask_resize(self) -> None:
+        """ Ask the user for new board dimensions in the form WIDTHxHEIGHT. """
+        answer = simpledialog.askstring("Resize", "Enter size (e.g., 10x8): ", parent=self.root)
+        try: width, height = [int(v) for v in answer.lower().split("x")]
+        except (AttributeError, ValueError): return
+        self.resize(width, height)
 
     def modify(self, action: int, direction: int) -> None:
         """ 
@@ -107,47 +166,41 @@ class Builder:
             If direction is 0, the user is requesting to perform
             the action on a row. Otherwise, if 1, by column. 
         """
-        # If remove, avoid going below dimensionality of 3x3
-        if (action == 1 and self.dimensionality[1 if direction == 0 else 0] <= 3): return
-
-        # Where action=0, add, action=1, remove 
-        # and direction=0, row, direction=1, col
-        for i in range(self.dimensionality[direction]):
-            x = i if direction == 0 else self.dimensionality[0]
-            y = i if direction == 1 else self.dimensionality[1]
-            if action == 0: self.new_tile(x, y, BLANK)
-            else:
-                button, _, _ = self.buttons[
-                    (x, y - 1) if direction == 0 else (x - 1, y)
-                ]
-                button.grid_forget()
-        
-        # Update the dimensionality of the board
         modifier = 1 if action == 0 else -1
         x, y = self.dimensionality
-        self.dimensionality = (x + modifier, y) if direction == 1 else (x, y + modifier)
+        if direction == 1: self.resize(x + modifier, y)
+        else: self.resize(x, y + modifier)
+
+    def paste_clipboard(self, key: Tuple[int, int]) -> None:
+        """
+            Paste a warehouse from the clipboard (plain text, or repr form
+            with \\n) with its top left corner at the clicked tile.
+            The board grows to fit the pasted warehouse.
+        """
+        try: text = self.root.clipboard_get()
+        except tk.TclError: return
+        lines = text.replace('\'', '').replace('"', '').replace('\\n', '\n').split('\n')
+        if not any(WALL in line for line in lines):
+            self.status.set("No warehouse to paste!")
+            self.root.after(STATUS_MS, lambda: self.status.set(""))
+            return
+        wh = Warehouse(); wh.from_lines(lines)
+        x, y = key
+        width, height = max(self.model.width, x + wh.ncols), max(self.model.height, y + wh.nrows)
+        changed = set()
+        if (width, height) != self.dimensionality: changed = self.model.resize(width, height)
+        self.repaint(changed | self.model.paste(["".join(r) for r in wh.as_array()], x, y))
 
     def as_rows(self) -> List[str]:
         """ Get the grid representation as an array of string rows. """
-        board = []
-        for y in range(self.dimensionality[1]):
-            row = ""
-            for x in range(self.dimensionality[0]):
-                if (x, y) in self.buttons:
-                    _, _, tile = self.buttons[(x, y)] 
-                    row += tile
-                else: row += BLANK
-            board.append(row)
-        return board
+        return self.model.rows()
 
     def copy_board(self) -> None:
         """ Copy the repr version of the board to clipboard. """
         self.status.set("Copied!")
         self.root.clipboard_clear()
         self.root.clipboard_append(repr('\n'.join(self.as_rows())))
-        self.root.update()
-        time.sleep(0.5)
-        self.status.set("")
+        self.root.after(STATUS_MS, lambda: self.status.set(""))
 
     def save_board(self) -> None:
         """ 
@@ -167,7 +220,5 @@ class Builder:
                 file.writelines(rows)
         else: self.status.set("Cancelled...")
 
-        self.root.update()
-        time.sleep(0.5)
-        self.status.set("")
+        self.root.after(STATUS_MS, lambda: self.status.set(""))
         pass
\ No newline at end of file
@@ -0,0 +1,68 @@
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Dict, Tuple
+from components.sokoban import Warehouse
+
+"""
+    Content addressed cache of parsed warehouses.
+    Files are keyed by the hash of their content, so renamed or copied files
+    are only parsed once, and a file is only re-read when its size or mtime changes.
+"""
+
+def content_hash(data: bytes) -> str:
+    """ Stable hash of a warehouse file's content. """
+    return hashlib.sha1(data).hexdigest()
+
+class ParseCache:
+    """
+        Holds recently parsed warehouses, keyed by content hash.
+        Cached warehouses are shared, so they must be treated as read-only
+        (use Warehouse.copy() before modifying one).
+    """
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.warehouses: "OrderedDict[str, Warehouse]" = OrderedDict()
+        self.stats: Dict[str, Tuple[int, int, str]] = {}
+
+    def hash_file(self, path: str) -> str:
+        """ Content hash of a file, only reading the file if it changed since last time. """
+        stat = os.stat(path)
+        known = self.stats.get(path)
+        if known != None and known[:2] == (stat.st_mtime_ns, stat.st_size): return known[2]
+        with open(path, 'rb') as f:
+            digest = content_hash(f.read())
+        self.stats[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def from_text(self, text: str) -> Warehouse:
+        """ Parse warehouse text, or return the cached parse of identical text. """
+        return self._get(content_hash(text.encode()), text)
+
+    def load(self, path: str) -> Warehouse:
+        """ Load a warehouse file, or return the cached parse if its content is unchanged. """
+        stat = os.stat(path)
+        known = self.stats.get(path)
+        if known != None and known[:2] == (stat.st_mtime_ns, stat.st_size) and known[2] in self.warehouses:
+            self.warehouses.move_to_end(known[2])
+            return self.warehouses[known[2]]
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = content_hash(data)
+        self.stats[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return self._get(digest, data.decode().replace('\r\n', '\n'))
+
+    def _get(self, digest: str, text: str) -> Warehouse:
+        if digest not in self.warehouses:
+            wh = Warehouse()
+            wh.from_lines(text.splitlines(True))
+            self.warehouses[digest] = wh
+            if len(self.warehouses) > self.maxsize: self.warehouses.popitem(last=False)
+        self.warehouses.move_to_end(digest)
+        return self.warehouses[digest]
+
+    def forget(self, path: str) -> None:
+        """ Drop the remembered stat of a path, i.e., when the file was removed. """
+        self.stats.pop(path, None)
+
+parse_cache = ParseCache()
@@ -0,0 +1,110 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+from components.cache import parse_cache
+from components.globals import BLANK, X, PLAYER_ON_TARGET, PLAYER_ON_TARGET2
+from components.sokoban import Warehouse
+
+"""
+    Symmetry aware canonical forms of warehouses, used to find duplicates in
+    collections where the same level is mirrored, rotated or padded differently.
+
+    Warehouse.from_lines already drops padding rows and leading columns, the rest of
+    the normalization (padding, taboo marks, alternative player characters) is done
+    here before picking the smallest form under the 8 grid symmetries.
+"""
+
+BATCH_SIZE = 256
+
+# Memo of file content hash -> canonical hash, so unchanged files are never canonicalized twice
+_canonical_by_content: Dict[str, str] = {}
+
+def normalize(wh: Warehouse) -> List[str]:
+    """ Trimmed rectangular rows of a warehouse, with taboo marks and '!' normalized away. """
+    rows = ["".join(r).replace(X, BLANK).replace(PLAYER_ON_TARGET2, PLAYER_ON_TARGET).rstrip()
+            for r in wh.as_array()]
+    width = max([len(r) for r in rows], default=0)
+    return [r.ljust(width) for r in rows]
+
+def symmetries(rows: List[Sequence]) -> List[List[Sequence]]:
+    """ All 8 rotations and reflections of rectangular rows (strings, or tuples of any values). """
+    join = "".join if rows and isinstance(rows[0], str) else tuple
+    transposed = [join(col) for col in zip(*rows)]
+    forms = []
+    for grid in (rows, transposed):
+        forms.append(grid)
+        forms.append([r[::-1] for r in grid])
+        forms.append(grid[::-1])
+        forms.append([r[::-1] for r in grid[::-1]])
+    return forms
+
+def weight_rows(wh: Warehouse, width: int) -> List[Tuple]:
+    """ Rows of the box weights (None where there is no box), the same shape as normalize's rows. """
+    weights = wh.box_weights()
+    return [tuple(weights.get((r, c)) for c in range(width)) for r in range(wh.nrows)]
+
+def canonical_form(wh: Warehouse) -> str:
+    """
+        The lexicographically smallest form of a warehouse under the 8 grid symmetries.
+        Box weights (if any) follow their boxes under each symmetry, and are appended
+        in box order, so differently weighted copies of a level are different forms.
+    """
+    rows = normalize(wh)
+    if not wh.weights: return min("\n".join(form) for form in symmetries(rows))
+    forms = zip(symmetries(rows), symmetries(weight_rows(wh, len(rows[0]) if rows else 0)))
+    board, weights = min(("\n".join(form), [w for row in grid for w in row if w != None]) for form, grid in forms)
+    return board + "\n" + " ".join(str(w) for w in weights)
+
+def canonical_hash(wh: Warehouse) -> str:
+    """ Stable hash of the canonical form, equal for mirrored, rotated and re-padded copies. """
+    return hashlib.sha1(canonical_form(wh).encode()).hexdigest()
+
+def _hash_batch(texts: List[str]) -> List[str]:
+    """ 
+        Canonical hashes of a batch of warehouse texts (run in worker processes).
+        Text which does not parse as a warehouse keeps its plain content hash.
+    """
+    hashes = []
+    for text in texts:
+        try: hashes.append(canonical_hash(parse_cache.from_text(text)))
+        except ValueError: hashes.append(hashlib.sha1(text.encode()).hexdigest())
+    return hashes
+
+def canonical_hashes(dir_path: str, filenames: List[str], workers: int = None) -> Dict[str, str]:
+    """
+        Canonical hash of every given file in a directory. Files are first keyed by content
+        hash (using the parse cache, which skips unchanged files), so each distinct content
+        is only canonicalized once. Large collections are hashed in batches across worker processes,
+        unless workers is 1 (i.e., from the main window), then they are hashed in the calling thread.
+    """
+    by_content = {name: parse_cache.hash_file(os.path.join(dir_path, name)) for name in filenames}
+    todo = {}
+    for name, digest in by_content.items():
+        if digest not in _canonical_by_content and digest not in todo: todo[digest] = name
+
+    if todo:
+        digests = list(todo)
+        texts = []
+        for digest in digests:
+            with open(os.path.join(dir_path, todo[digest]), 'rb') as f:
+                texts.append(f.read().decode("utf-8", "replace"))
+        batches = [texts[i:i + BATCH_SIZE] for i in range(0, len(texts), BATCH_SIZE)]
+        if len(batches) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = [h for batch in pool.map(_hash_batch, batches) for h in batch]
+        else: results = [h for batch in batches for h in _hash_batch(batch)]
+        _canonical_by_content.update(zip(digests, results))
+
+    return {name: _canonical_by_content[digest] for name, digest in by_content.items()}
+
+def duplicate_groups(dir_path: str, filenames: List[str] = None, workers: int = None) -> List[List[str]]:
+    """
+        Groups of files in a directory that are the same warehouse up to symmetry
+        and padding. Only groups with more than one file are returned, each sorted by name.
+    """
+    if filenames == None: filenames = [f for f in os.listdir(dir_path) if f.split('.')[-1] == "txt"]
+    groups: Dict[str, List[str]] = {}
+    for name, digest in canonical_hashes(dir_path, filenames, workers).items():
+        groups.setdefault(digest, []).append(name)
+    return sorted(sorted(group) for group in groups.values() if len(group) > 1)
@@ -0,0 +1,120 @@
+from typing import Sequence, Set, Tuple
+from components.globals import *
+from components import npgrid
+
+"""
+    Deadlock detection for a board held as rows of characters (indexed rows[y][x]).
+    All cells are (x, y) tuples, the same as Board.player and the Board tile keys.
+
+    taboo_cells() is computed once per warehouse, and find_deadlocks() is cheap
+    enough to run after every push since it only looks at the area around the
+    box which was just moved.
+"""
+
+Cell = Tuple[int, int]
+Rows = Sequence[Sequence[str]]
+
+TARGET_CHARS = (TARGET, BOX_ON_TARGET, PLAYER_ON_TARGET, PLAYER_ON_TARGET2)
+BOX_CHARS = (BOX, BOX_ON_TARGET)
+PLAYER_CHARS = (PLAYER, PLAYER_ON_TARGET, PLAYER_ON_TARGET2)
+
+def _char(rows: Rows, cell: Cell) -> str:
+    x, y = cell
+    if 0 <= y < len(rows) and 0 <= x < len(rows[y]): return rows[y][x]
+    return WALL # anything outside of the board behaves as a wall
+
+def _neighbours(cell: Cell) -> Tuple[Cell, Cell, Cell, Cell]:
+    x, y = cell
+    return ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1))
+
+def interior(rows: Rows) -> Set[Cell]:
+    """
+        Cells the player could ever stand on, i.e., reachable from the
+        player without crossing walls (boxes are ignored).
+    """
+    start = [(x, y) for y, row in enumerate(rows) for x, c in enumerate(row) if c in PLAYER_CHARS]
+    if not start: return {(x, y) for y, row in enumerate(rows) for x, c in enumerate(row) if c != WALL}
+    seen, stack = {start[0]}, [start[0]]
+    while stack:
+        for n in _neighbours(stack.pop()):
+            if n not in seen and _char(rows, n) != WALL:
+                seen.add(n); stack.append(n)
+    return seen
+
+def taboo_cells(rows: Rows) -> Set[Cell]:
+    """
+        Simple taboo cells, following the CAB320 definition.
+        1. An interior corner cell which is not a target is taboo.
+        2. Every cell between two taboo corners along a wall is taboo, if none
+           of those cells are targets and the wall runs along the whole side.
+    """
+    inside = interior(rows)
+    wall = lambda cell: _char(rows, cell) == WALL
+    if npgrid.HAS_NUMPY:
+        # Corners of the whole board at once, then keep the interior ones
+        corners = set(npgrid.cells(npgrid.dead_corners(npgrid.from_rows(rows)))) & inside
+    else:
+        corners = set()
+        for cell in inside:
+            if _char(rows, cell) in TARGET_CHARS: continue
+            left, right, up, down = [wall(n) for n in _neighbours(cell)]
+            if (left or right) and (up or down): corners.add(cell)
+
+    taboo = set(corners)
+    for x0, y0 in corners:
+        for dx, dy in ((1, 0), (0, 1)):
+            # Walk from the corner until hitting the next wall, collecting the cells in between
+            between, x, y = [], x0 + dx, y0 + dy
+            while (x, y) in inside and (x, y) not in corners and _char(rows, (x, y)) not in TARGET_CHARS:
+                between.append((x, y)); x += dx; y += dy
+            if (x, y) not in corners: continue
+            for side in (-1, 1):
+                if all(wall((cx + dy * side, cy + dx * side)) for cx, cy in between):
+                    taboo.update(between)
+                    break
+    return taboo
+
+def _frozen(rows: Rows, cell: Cell, taboo: Set[Cell], chain: Set[Cell], frozen: Set[Cell]) -> bool:
+    """
+        A box is frozen when it is blocked both horizontally and vertically.
+        An axis is blocked by a wall, by taboo cells on both sides, or by a
+        neighbouring box that is itself frozen. Boxes already in the chain
+        are treated as walls to avoid checking in circles.
+    """
+    chain, found = chain | {cell}, {cell}
+    left, right, up, down = _neighbours(cell)
+    for a, b in ((left, right), (up, down)):
+        if _char(rows, a) == WALL or _char(rows, b) == WALL or a in chain or b in chain: continue
+        if a in taboo and b in taboo: continue
+        for n in (a, b):
+            sub = set()
+            if _char(rows, n) in BOX_CHARS and _frozen(rows, n, taboo, chain, sub):
+                found |= sub
+                break
+        else: return False
+    frozen |= found
+    return True
+
+def find_deadlocks(rows: Rows, box: Cell, taboo: Set[Cell]) -> Set[Cell]:
+    """
+        Checks the surroundings of a box that was just pushed to the given cell.
+        Returns the cells of every box found to be deadlocked, otherwise an empty set.
+        Covers simple taboo cells, 2x2 blocks of walls and boxes, and freeze deadlocks.
+    """
+    if _char(rows, box) not in BOX_CHARS: return set()
+    off_target = lambda cell: _char(rows, cell) == BOX
+    if box in taboo: return {box}
+
+    # Any 2x2 square of walls and boxes containing an off-target box can never be undone
+    deadlocked = set()
+    x, y = box
+    for sx, sy in ((x - 1, y - 1), (x, y - 1), (x - 1, y), (x, y)):
+        square = [(sx, sy), (sx + 1, sy), (sx, sy + 1), (sx + 1, sy + 1)]
+        if all(_char(rows, c) in BOX_CHARS + (WALL,) for c in square):
+            deadlocked.update(c for c in square if off_target(c))
+    if deadlocked: return deadlocked
+
+    frozen = set()
+    if _frozen(rows, box, taboo, set(), frozen):
+        deadlocked.update(c for c in frozen if off_target(c))
+    return deadlocked
@@ -0,0 +1,121 @@
+import json
+from functools import lru_cache
+from typing import Iterable, List, Set, Tuple
+from components.globals import WALL
+from components import npgrid
+from components.grid import Grid
+from components.parsing import board_lines
+from components.sokoban import Warehouse
+
+"""
+    Compares an expected board with an actual board, i.e., the two strings
+    from a failing test. Both are parsed through Warehouse.from_lines, so they
+    are aligned on their canonical (0, 0), then compared cell by cell on compact grids.
+    All cells are reported as (x, y), the same as the board tools.
+"""
+
+Cell = Tuple[int, int]
+
+class BoardDiff:
+    """ The per-cell and per-element differences between an expected and an actual board. """
+    def __init__(self, expected: Warehouse, actual: Warehouse, cells: Set[Cell]) -> None:
+        xy = lambda cells: {(c, r) for r, c in cells}
+        self.cells = cells
+        self.missing_boxes: Set[Cell] = xy(expected.boxes) - xy(actual.boxes)
+        self.extra_boxes: Set[Cell] = xy(actual.boxes) - xy(expected.boxes)
+        self.expected_player: Cell = None if expected.worker == None else xy([expected.worker]).pop()
+        self.actual_player: Cell = None if actual.worker == None else xy([actual.worker]).pop()
+        self.expected_size = (expected.ncols, expected.nrows)
+        self.actual_size = (actual.ncols, actual.nrows)
+
+    @property
+    def equal(self) -> bool:
+        return not self.cells
+
+    def summary(self) -> List[str]:
+        """ Human readable lines describing the differences. """
+        if self.equal: return ["Boards are identical."]
+        lines = [f"{len(self.cells)} cell(s) differ."]
+        if self.expected_size != self.actual_size:
+            lines.append(f"Size differs: expected {self.expected_size}, got {self.actual_size}.")
+        if self.expected_player != self.actual_player:
+            lines.append(f"Player expected at {self.expected_player}, got {self.actual_player}.")
+        if self.missing_boxes: lines.append(f"Boxes missing from: {sorted(self.missing_boxes)}")
+        if self.extra_boxes: lines.append(f"Boxes unexpected at: {sorted(self.extra_boxes)}")
+        return lines
+
+    def as_dict(self) -> dict:
+        """ Machine readable form of the differences, i.e., for a json report. """
+        return {
+            "equal": self.equal,
+            "cells": sorted(self.cells),
+            "missing_boxes": sorted(self.missing_boxes),
+            "extra_boxes": sorted(self.extra_boxes),
+            "expected_player": self.expected_player,
+            "actual_player": self.actual_player,
+            "expected_size": self.expected_size,
+            "actual_size": self.actual_size,
+        }
+
+@lru_cache(maxsize=4096)
+def parse(text: str) -> Warehouse:
+    """ 
+        Parse a board string, in plain or repr form, into a warehouse.
+        Parsed boards are cached, since result files tend to repeat the expected boards.
+    """
+    wh = Warehouse()
+    wh.from_lines(board_lines(text))
+    return wh
+
+def diff_warehouses(expected: Warehouse, actual: Warehouse) -> BoardDiff:
+    """ Compare two warehouses on grids padded to the same size. """
+    if npgrid.HAS_NUMPY:
+        a, b = expected.as_numpy(), actual.as_numpy()
+        if npgrid.equal(a, b): return BoardDiff(expected, actual, set())
+        return BoardDiff(expected, actual, set(npgrid.diff_cells(a, b)))
+
+    a, b = Grid.from_rows(str(expected).split("\n")), Grid.from_rows(str(actual).split("\n"))
+    width, height = max(a.width, b.width), max(a.height, b.height)
+    for grid in (a, b):
+        if (grid.width, grid.height) != (width, height): grid.resize(width, height)
+
+    # Identical boards are the common case, and are found with a single bytes comparison
+    if a.data == b.data: return BoardDiff(expected, actual, set())
+    cells = {(i % width, i // width) for i, (p, q) in enumerate(zip(a.data, b.data)) if p != q}
+    return BoardDiff(expected, actual, cells)
+
+def diff_boards(expected: str, actual: str) -> BoardDiff:
+    """ Compare an expected board string with an actual board string. """
+    return diff_warehouses(parse(expected), parse(actual))
+
+def load_pairs(path: str) -> List[dict]:
+    """
+        Load (expected, actual) pairs from a results file. The file is either json,
+        or json lines, where each entry is a [expected, actual] pair or an object
+        with "expected" and "actual" keys (and optionally a "name").
+    """
+    with open(path) as f:
+        text = f.read()
+    try: entries = json.loads(text)
+    except json.JSONDecodeError: entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(entries, dict): entries = [entries]
+    pairs = []
+    for i, entry in enumerate(entries):
+        if isinstance(entry, dict): pairs.append({"name": entry.get("name", str(i)), **entry})
+        else: pairs.append({"name": str(i), "expected": entry[0], "actual": entry[1]})
+    return pairs
+
+def diff_report(pairs: Iterable[dict]) -> List[dict]:
+    """
+        Diff every (expected, actual) pair headlessly. Results which are not boards
+        (i.e., "Impossible") are compared as plain text.
+        Returns one report entry per pair.
+    """
+    report = []
+    for pair in pairs:
+        expected, actual = pair["expected"], pair["actual"]
+        if WALL not in expected or WALL not in actual:
+            entry = {"equal": expected == actual, "expected_text": expected, "actual_text": actual}
+        else: entry = diff_boards(expected, actual).as_dict()
+        report.append({"name": pair["name"], **entry})
+    return report
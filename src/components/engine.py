@@ -0,0 +1,87 @@
+from typing import Iterable, List, Optional, Sequence
+from components.globals import *
+from components.sokoban import Warehouse
+
+"""
+    Headless move engine, with the same move rules as Board.try_tile_shift
+    but without any tkinter. The board is held as one flat bytearray,
+    so that replaying long action sequences is cheap.
+"""
+
+_BLANK, _TARGET, _BOX, _BOX_ON_TARGET = ord(BLANK), ord(TARGET), ord(BOX), ord(BOX_ON_TARGET)
+_PLAYER, _PLAYER_ON_TARGET = ord(PLAYER), ord(PLAYER_ON_TARGET)
+_PLAYERS = (ord(PLAYER), ord(PLAYER_ON_TARGET), ord(PLAYER_ON_TARGET2))
+_LEFT_BEHIND = {ord(PLAYER): _BLANK, ord(PLAYER_ON_TARGET): _TARGET, ord(PLAYER_ON_TARGET2): _TARGET}
+
+class Engine:
+    """
+        Replays moves on a warehouse without a gui.
+        Moves are direction names from globals.DIRECTIONS (i.e., "Up").
+    """
+    def __init__(self, rows: Sequence[Sequence[str]], weights: List[int] = None) -> None:
+        rows = ["".join(r) for r in rows]
+        self.width = max([len(r) for r in rows], default=0)
+        self.height = len(rows)
+        self.cells = bytearray("".join(r.ljust(self.width) for r in rows).encode())
+        self.player = next((i for i, c in enumerate(self.cells) if c in _PLAYERS), None)
+        self.offsets = {name: dy * self.width + dx for name, (dx, dy) in DIRECTIONS.items()}
+        self.last_push: Optional[int] = None
+
+        # Weights follow their boxes by cell index, so the running cost is O(1) per move
+        boxes = [i for i, c in enumerate(self.cells) if c in (_BOX, _BOX_ON_TARGET)]
+        weights = weights or []
+        self.box_weights = {i: weights[n] for n, i in enumerate(boxes) if n < len(weights) and weights[n]}
+        self.cost = 0
+
+    @classmethod
+    def from_warehouse(cls, wh: Warehouse) -> "Engine":
+        return cls(wh.as_array(), wh.weights)
+
+    def _inside(self, i: int, j: int) -> bool:
+        """ True if j is on the board, and a sideways step from i did not wrap onto another row. """
+        return 0 <= j < len(self.cells) and (abs(j - i) != 1 or j // self.width == i // self.width)
+
+    def move(self, name: str) -> bool:
+        """
+            Attempt to move the player in a direction, pushing a box if there is one.
+            Returns true if the move is possible, otherwise false (and nothing changes).
+            The cell index of a pushed box is left in self.last_push.
+            Every move costs 1, plus the weight of the box when pushing one.
+        """
+        self.last_push = None
+        if self.player == None: return False
+        cells, p, d = self.cells, self.player, self.offsets[name]
+        n = p + d
+        if not self._inside(p, n): return False
+        c = cells[n]
+        if c == _BOX or c == _BOX_ON_TARGET:
+            nn = n + d
+            if not self._inside(n, nn) or cells[nn] not in (_BLANK, _TARGET): return False
+            cells[nn] = _BOX if cells[nn] == _BLANK else _BOX_ON_TARGET
+            c = _BLANK if c == _BOX else _TARGET
+            self.last_push = nn
+            if n in self.box_weights:
+                weight = self.box_weights[nn] = self.box_weights.pop(n)
+                self.cost += weight
+        elif c != _BLANK and c != _TARGET: return False
+        cells[p] = _LEFT_BEHIND[cells[p]]
+        cells[n] = _PLAYER if c == _BLANK else _PLAYER_ON_TARGET
+        self.player = n
+        self.cost += 1
+        return True
+
+    def replay(self, moves: Iterable[str]) -> str:
+        """
+            Apply every move in order. Returns the final board as a string,
+            or IMPOSSIBLE as soon as any move cannot be made.
+        """
+        for name in moves:
+            if not self.move(name): return IMPOSSIBLE
+        return str(self)
+
+    def rows(self) -> List[str]:
+        w = self.width
+        return [self.cells[y * w:(y + 1) * w].decode() for y in range(self.height)]
+
+    def __str__(self) -> str:
+        return "\n".join(self.rows())
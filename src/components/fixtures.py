@@ -0,0 +1,126 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+from components.cache import content_hash
+from components.deadlock import taboo_cells
+from components.scoring import score
+from components.globals import X
+from components.sokoban import Warehouse
+
+"""
+    Headless pipeline for turning a directory of warehouses into test fixtures.
+    For each warehouse it computes what the tools would copy to the clipboard:
+        board       the repr of the board (Visualize)
+        taboo       the taboo cells marked with X on the walls (Taboo "Copy REPR")
+        sequences   the final state of each registered sequence (Sequence "Copy Result"),
+                    and its total cost (box weights included)
+
+    Sequences are registered per warehouse in sequences.json inside the warehouse directory,
+    i.e., {"wh_1.txt": {"solution": ["Up", "Left"]}}.
+    Results are cached by content hash, so only changed warehouses are recomputed.
+"""
+
+SEQUENCES_JSON = "sequences.json"
+CACHE_JSON = ".fixtures-cache.json"
+FIXTURE_VERSION = 2 # bump when the fixture format changes, so cached fixtures are recomputed
+
+def load_sequences(dir_path: str) -> Dict[str, Dict[str, List[str]]]:
+    """ Read the registered sequences of a warehouse directory. """
+    path = os.path.join(dir_path, SEQUENCES_JSON)
+    if not os.path.exists(path): return {}
+    with open(path) as f:
+        return json.load(f)
+
+def register_sequence(dir_path: str, filename: str, name: str, moves: List[str]) -> None:
+    """ Register (or replace) a named sequence of moves for a warehouse file. """
+    sequences = load_sequences(dir_path)
+    sequences.setdefault(filename, {})[name] = list(moves)
+    with open(os.path.join(dir_path, SEQUENCES_JSON), 'w') as f:
+        json.dump(sequences, f, indent=4)
+
+def taboo_string(wh: Warehouse) -> str:
+    """ The walls of a warehouse with every taboo cell marked X, as the Taboo tool copies it. """
+    grid = wh.as_array(walls_only=True)
+    for x, y in taboo_cells(wh.as_array()): grid[y][x] = X
+    return "\n".join("".join(row) for row in grid)
+
+def compute_fixture(job: Tuple[str, str, Dict[str, List[str]]]) -> dict:
+    """
+        Compute the fixture of one warehouse, from its name, text and registered sequences.
+        A warehouse which cannot be parsed gets {"warehouse": filename, "error": ...} instead.
+    """
+    filename, text, sequences = job
+    wh = Warehouse()
+    try: wh.from_lines(text.splitlines(True))
+    except (ValueError, IndexError): return {"warehouse": filename, "error": "Unable to parse the warehouse."}
+    return {
+        "warehouse": filename,
+        "board": str(wh),
+        "taboo": taboo_string(wh),
+        "sequences": {name: sequence_fixture(wh, moves) for name, moves in sequences.items()},
+    }
+
+def sequence_fixture(wh: Warehouse, moves: List[str]) -> dict:
+    """ The final state and total cost of a sequence of moves. """
+    result, cost = score(wh, moves)
+    return {"actions": moves, "result": result, "cost": cost}
+
+def export_fixtures(dir_path: str, workers: int = None) -> Tuple[List[dict], int, List[dict]]:
+    """
+        Compute the fixtures of every warehouse in a directory. Warehouses whose
+        content (and registered sequences) hash is unchanged since the last export
+        are taken from the cache, the rest are computed in parallel worker processes.
+        Returns the fixtures in filename order, how many were recomputed, and the
+        files skipped because they could not be parsed (each with its error).
+    """
+    sequences = load_sequences(dir_path)
+    cache_path = os.path.join(dir_path, CACHE_JSON)
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            cache = json.load(f)
+
+    fixtures, jobs, hashes = {}, [], {}
+    for filename in sorted(f for f in os.listdir(dir_path) if f.split('.')[-1] == "txt"):
+        with open(os.path.join(dir_path, filename), 'rb') as f:
+            data = f.read()
+        registered = sequences.get(filename, {})
+        digest = content_hash(data + json.dumps([FIXTURE_VERSION, registered], sort_keys=True).encode())
+        hashes[filename] = digest
+        if cache.get(filename, {}).get("hash") == digest: fixtures[filename] = cache[filename]["fixture"]
+        else: jobs.append((filename, data.decode("utf-8", "replace").replace('\r\n', '\n'), registered))
+
+    if len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = list(pool.map(compute_fixture, jobs, chunksize=max(1, len(jobs) // 64)))
+    else: computed = [compute_fixture(job) for job in jobs]
+    skipped = [fixture for fixture in computed if "error" in fixture]
+    for fixture in computed:
+        if "error" not in fixture: fixtures[fixture["warehouse"]] = fixture
+
+    with open(cache_path, 'w') as f:
+        json.dump({name: {"hash": hashes[name], "fixture": fixtures[name]} for name in fixtures}, f)
+    return [fixtures[name] for name in sorted(fixtures)], len(jobs), skipped
+
+def write_json(fixtures: List[dict], path: str) -> None:
+    with open(path, 'w') as f:
+        json.dump(fixtures, f, indent=4)
+
+def write_pytest(fixtures: List[dict], path: str) -> None:
+    """ Write the fixtures as a python module of pytest parametrize decorators. """
+    taboo = [(f["warehouse"], f["taboo"]) for f in fixtures]
+    sequences = [
+        (f["warehouse"], name, s["actions"], s["result"])
+        for f in fixtures for name, s in f["sequences"].items()
+    ]
+    boards = [(f["warehouse"], f["board"]) for f in fixtures]
+    with open(path, 'w') as f:
+        f.write("# Generated by sokoban-cli.py export, changes will be overwritten.\n")
+        f.write("import pytest\n\n")
+        f.write(f"BOARDS = {boards!r}\n\n")
+        f.write(f"TABOO = {taboo!r}\n\n")
+        f.write(f"SEQUENCES = {sequences!r}\n\n")
+        f.write("board_cases = pytest.mark.parametrize(\"warehouse, expected\", BOARDS)\n")
+        f.write("taboo_cases = pytest.mark.parametrize(\"warehouse, expected\", TABOO)\n")
+        f.write("sequence_cases = pytest.mark.parametrize(\"warehouse, name, actions, expected\", SEQUENCES)\n")
@@ -0,0 +1,125 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from components.engine import Engine
+from components.fixtures import load_sequences
+from components.globals import DIRECTIONS
+
+"""
+    Differential fuzzing of the move rules: the Board (headless, without Tk tiles)
+    and the Engine are given the same action sequences, and must agree on
+    which moves are possible, the final board, and the total cost.
+
+    Sequences are either random, or mutations of the sequences registered for the
+    warehouse (which reach deeper into the puzzle than random walks do).
+    Any divergence is shrunk to a minimal sequence which still reproduces it.
+"""
+
+NAMES = list(DIRECTIONS)
+
+_boards: Dict[str, object] = {}
+
+def _board(path: str):
+    """ The headless Board of a warehouse in this process, created once and reused. """
+    if path not in _boards:
+        from components.board import Board
+        from components.globals import BUTTONS, TABOO
+        _boards[path] = Board(None, path, config={BUTTONS: False, TABOO: False})
+    return _boards[path]
+
+def compare(board, moves: List[str]) -> Optional[Tuple[int, str]]:
+    """
+        Play the moves on the (reset) board and on a fresh engine in lockstep, without repainting.
+        Returns None if they agree, otherwise (moves needed to see it, description of the divergence).
+    """
+    board.reset()
+    engine = Engine(board.board, board.wh.weights)
+    for i, d in enumerate(moves):
+        try: moved = board.shift(DIRECTIONS[d]) != None
+        except Exception as e: return i + 1, f"Board raised {type(e).__name__}: {e} on move {i}"
+        if moved != engine.move(d):
+            return i + 1, f"Move {i} ({d}) is {'possible' if moved else 'impossible'} for the Board only"
+    if str(board) != str(engine): return len(moves), "Final boards differ"
+    if board.cost != engine.cost: return len(moves), f"Cost differs, Board {board.cost} vs Engine {engine.cost}"
+    return None
+
+def shrink(moves: List[str], diverges: Callable[[List[str]], bool]) -> List[str]:
+    """ Delta debugging, remove ever smaller chunks of moves while the divergence still reproduces. """
+    n = 2
+    while len(moves) >= 2:
+        size = -(-len(moves) // n)
+        for i in range(0, len(moves), size):
+            candidate = moves[:i] + moves[i + size:]
+            if diverges(candidate):
+                moves, n = candidate, max(n - 1, 2)
+                break
+        else:
+            if n >= len(moves): break
+            n = min(len(moves), n * 2)
+    return moves
+
+def mutate(moves: List[str], rng: random.Random) -> List[str]:
+    """ A few random insertions, deletions and replacements of a registered sequence. """
+    moves = list(moves)
+    for _ in range(rng.randint(1, 4)):
+        i = rng.randint(0, len(moves))
+        edit = rng.randrange(3)
+        if edit == 0 or not moves: moves.insert(i, rng.choice(NAMES))
+        elif edit == 1: del moves[min(i, len(moves) - 1)]
+        else: moves[min(i, len(moves) - 1)] = rng.choice(NAMES)
+    return moves
+
+def fuzz_warehouse(job: Tuple[str, int, int, int, List[List[str]]]) -> dict:
+    """
+        Fuzz one warehouse with a number of sequences, from a seed.
+        Returns how many sequences were run, and each divergence shrunk to a minimal sequence.
+    """
+    path, seed, count, length, registered = job
+    rng = random.Random(seed)
+    board = _board(path)
+    divergences = {}
+    for _ in range(count):
+        if registered and rng.random() < 0.5: moves = mutate(rng.choice(registered), rng)
+        else: moves = rng.choices(NAMES, k=rng.randint(1, length))
+        found = compare(board, moves)
+        if found == None: continue
+        minimal = shrink(moves[:found[0]], lambda m: compare(board, m) != None)
+        reason = compare(board, minimal)[1]
+        divergences.setdefault(reason, minimal) # one reproduction per kind of divergence
+    return {"warehouse": os.path.basename(path), "sequences": count,
+            "divergences": [{"reason": r, "moves": m} for r, m in divergences.items()]}
+
+def fuzz(dir_path: str, sequences: int = 100000, length: int = 60, workers: int = None, seed: int = None) -> dict:
+    """
+        Fuzz every warehouse of a directory in parallel worker processes,
+        each with its own boards. Returns the report, including sequences per second.
+    """
+    seed = random.randrange(2 ** 32) if seed == None else seed
+    registered = load_sequences(dir_path)
+    filenames = sorted(f for f in os.listdir(dir_path) if f.split('.')[-1] == "txt")
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, min(5000, sequences // max(1, len(filenames) * workers)))
+    jobs, remaining, i = [], sequences, 0
+    while remaining > 0 and filenames:
+        filename = filenames[i % len(filenames)]
+        count = min(chunk, remaining)
+        jobs.append((os.path.join(dir_path, filename), seed + i, count, length,
+                     list(registered.get(filename, {}).values())))
+        remaining -= count; i += 1
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(fuzz_warehouse, jobs))
+    elapsed = time.perf_counter() - start
+
+    divergences = {}
+    for result in results:
+        for d in result["divergences"]:
+            key = (result["warehouse"], d["reason"])
+            if key not in divergences or len(d["moves"]) < len(divergences[key]["moves"]):
+                divergences[key] = {"warehouse": result["warehouse"], **d}
+    run = sum(result["sequences"] for result in results)
+    return {"seed": seed, "sequences": run, "seconds": elapsed, "per_second": run / elapsed if elapsed else 0.0,
+            "divergences": sorted(divergences.values(), key=lambda d: (d["warehouse"], len(d["moves"])))}
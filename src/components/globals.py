@@ -2,9 +2,10 @@ import os
 
 SRC_PATH = "\\".join(os.path.realpath(__file__).split('\\')[:-2])
 
+# Direction vectors are (x, y) in screen coordinates, so Up decreases the row
 DIRECTIONS = {
-    "Up": (0, 1),
-    "Down": (0, -1),
+    "Up": (0, -1),
+    "Down": (0, 1),
     "Left": (-1, 0),
     "Right": (1, 0),
 }
@@ -31,9 +32,15 @@ IMAGES = {
     X: SRC_PATH + "\\assets\\taboo.png"
 }
 
+IMPOSSIBLE = "Impossible" # result of an action sequence with an illegal move, as in CAB320
+
 INVAILD_TABOO_REPR_CHARS = [BOX_ON_TARGET, PLAYER_ON_TARGET, PLAYER_ON_TARGET2, TARGET, WALL]
 LEGAL_CHARS = [BLANK, BOX, BOX_ON_TARGET, PLAYER, PLAYER_ON_TARGET, PLAYER_ON_TARGET2, TARGET, WALL, X]
 
-VISUALIZE = 1; TABOO = 2; BUTTONS = 2.1; SEQUENCE = 3
+VISUALIZE = 1; TABOO = 2; BUTTONS = 2.1; SEQUENCE = 3; DEADLOCKS = 3.1
+
+H1 = ("Arial", 12, "bold")
+WEIGHT_FONT = ("Arial", 10, "bold")
 
-H1 = ("Arial", 12, "bold")
\ No newline at end of file
+WAREHOUSE_CHANGED = "<<WarehouseChanged>>" # virtual event sent to windows when their .txt file changes
+STATUS_MS = 500 # how long a short status (i.e., "Copied!") is shown, without blocking the event loop
@@ -0,0 +1,153 @@
+from typing import Iterable, List, Set, Tuple
+from components.globals import BLANK, WALL, PLAYER, PLAYER_ON_TARGET, PLAYER_ON_TARGET2
+
+Cell = Tuple[int, int]
+
+class Grid:
+    """
+        Compact character grid, stored as a single bytearray of
+        ascii tile characters in row-major order (index = y * width + x).
+
+        Every bulk operation returns the set of (x, y) cells it changed,
+        so that a view can repaint only those cells in one batch.
+    """
+    def __init__(self, width: int, height: int, fill: str = BLANK) -> None:
+        self.width = width
+        self.height = height
+        self.data = bytearray(fill.encode() * (width * height))
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[str]) -> "Grid":
+        """ Create a grid from string rows, short rows are padded with BLANK. """
+        rows = [r.replace('\n', '') for r in rows]
+        grid = cls(max([len(r) for r in rows], default=0), len(rows))
+        for y, row in enumerate(rows):
+            start = y * grid.width
+            grid.data[start:start + len(row)] = row.encode()
+        return grid
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __getitem__(self, cell: Cell) -> str:
+        x, y = cell
+        return chr(self.data[y * self.width + x])
+
+    def __setitem__(self, cell: Cell, char: str) -> None:
+        x, y = cell
+        self.data[y * self.width + x] = ord(char)
+
+    def set(self, x: int, y: int, char: str) -> Set[Cell]:
+        """ Set a single cell, returns the changed cells (empty if unchanged). """
+        i = y * self.width + x
+        if self.data[i] == ord(char): return set()
+        self.data[i] = ord(char)
+        return {(x, y)}
+
+    def fill_rect(self, x0: int, y0: int, x1: int, y1: int, char: str) -> Set[Cell]:
+        """ Fill the inclusive rectangle between two corners (any order) with a char. """
+        x0, x1 = max(0, min(x0, x1)), min(self.width - 1, max(x0, x1))
+        y0, y1 = max(0, min(y0, y1)), min(self.height - 1, max(y0, y1))
+        if x0 > x1 or y0 > y1: return set() # the rectangle misses the grid
+        code, changed = ord(char), set()
+        for y in range(y0, y1 + 1):
+            start = y * self.width
+            row = self.data[start + x0:start + x1 + 1]
+            changed.update((x0 + i, y) for i, c in enumerate(row) if c != code)
+            self.data[start + x0:start + x1 + 1] = bytes([code]) * len(row)
+        return changed
+
+    def flood_fill(self, x: int, y: int, char: str) -> Set[Cell]:
+        """ Replace the 4-connected region of identical tiles around (x, y) with char. """
+        w, code = self.width, ord(char)
+        old = self.data[y * w + x]
+        if old == code: return set()
+        stack, changed = [y * w + x], set()
+        self.data[y * w + x] = code
+        while stack:
+            i = stack.pop()
+            cx, cy = i % w, i // w
+            changed.add((cx, cy))
+            for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+                j = ny * w + nx
+                if self.in_bounds(nx, ny) and self.data[j] == old:
+                    self.data[j] = code
+                    stack.append(j)
+        return changed
+
+    def paste(self, rows: List[str], ox: int, oy: int) -> Set[Cell]:
+        """
+            Copy string rows onto the grid with their top left corner at (ox, oy).
+            Anything falling outside the grid is clipped.
+        """
+        changed = set()
+        for dy, row in enumerate(rows):
+            for dx, char in enumerate(row):
+                if self.in_bounds(ox + dx, oy + dy): changed |= self.set(ox + dx, oy + dy, char)
+        return changed
+
+    def resize(self, width: int, height: int, dx: int = 0, dy: int = 0) -> Set[Cell]:
+        """
+            Resize the grid to any dimensions, shifting the existing content by (dx, dy).
+            New cells are BLANK. Returns the cells whose tile differs from before,
+            including every cell that did not previously exist.
+        """
+        old = Grid(self.width, self.height); old.data = self.data
+        self.width, self.height = width, height
+        self.data = bytearray(BLANK.encode() * (width * height))
+        for y in range(old.height):
+            ny = y + dy
+            if not 0 <= ny < height: continue
+            src_x0, src_x1 = max(0, -dx), min(old.width, width - dx)
+            if src_x0 >= src_x1: continue
+            start = ny * width + src_x0 + dx
+            self.data[start:start + src_x1 - src_x0] = old.data[y * old.width + src_x0:y * old.width + src_x1]
+        return {(x, y) for y in range(height) for x in range(width)
+                if not old.in_bounds(x, y) or old[x, y] != self[x, y]}
+
+    def wrap_walls(self) -> Set[Cell]:
+        """
+            Surround the playable area with walls. The playable area is the region
+            reachable from the player without crossing walls, or every non-blank
+            tile if there is no player. Walls are placed on every cell bordering the
+            area (including diagonals), growing the grid if the area touches an edge.
+        """
+        w = self.width
+        players = [i for i, c in enumerate(self.data)
+                   if chr(c) in (PLAYER, PLAYER_ON_TARGET, PLAYER_ON_TARGET2)]
+        if players:
+            area, stack = {players[0]}, [players[0]]
+            while stack:
+                i = stack.pop()
+                cx, cy = i % w, i // w
+                for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+                    j = ny * w + nx
+                    if self.in_bounds(nx, ny) and j not in area and self.data[j] != ord(WALL):
+                        area.add(j); stack.append(j)
+        else: area = {i for i, c in enumerate(self.data) if c not in (ord(BLANK), ord(WALL))}
+        if not area: return set()
+
+        # Grow the grid if the area touches an edge, so the wall fits around it
+        xs, ys = [i % w for i in area], [i // w for i in area]
+        dx, dy = int(min(xs) == 0), int(min(ys) == 0)
+        grow_x, grow_y = dx + int(max(xs) == w - 1), dy + int(max(ys) == self.height - 1)
+        changed = set()
+        if grow_x or grow_y:
+            changed = self.resize(self.width + grow_x, self.height + grow_y, dx, dy)
+            area = {(i % w + dx, i // w + dy) for i in area}
+        else: area = {(i % w, i // w) for i in area}
+
+        for cx, cy in area:
+            for nx in (cx - 1, cx, cx + 1):
+                for ny in (cy - 1, cy, cy + 1):
+                    if (nx, ny) not in area and self[nx, ny] == BLANK:
+                        changed |= self.set(nx, ny, WALL)
+        return changed
+
+    def rows(self) -> List[str]:
+        """ Get the grid as a list of string rows. """
+        w = self.width
+        return [self.data[y * w:(y + 1) * w].decode() for y in range(self.height)]
+
+    def __str__(self) -> str:
+        return "\n".join(self.rows())
@@ -0,0 +1,93 @@
+from typing import List, Sequence, Tuple
+from components.globals import *
+
+"""
+    Optional NumPy view of a board, as a (rows, cols) uint8 array of the
+    ascii tile characters. Whole-board questions (masks, neighbour counts,
+    comparisons) then run vectorized instead of as Python loops.
+
+    NumPy is not a requirement of the tool, check HAS_NUMPY before using this module,
+    every feature using it keeps a pure Python fallback.
+"""
+
+try: import numpy as np
+except ImportError: np = None
+
+HAS_NUMPY = np is not None
+
+Cell = Tuple[int, int]
+
+def _codes(chars: Sequence[str]) -> List[int]:
+    return [ord(c) for c in chars]
+
+def from_rows(rows: Sequence[Sequence[str]]) -> "np.ndarray":
+    """ Board rows (strings or lists of chars) to a uint8 grid, short rows padded with BLANK. """
+    rows = ["".join(r) for r in rows]
+    width = max([len(r) for r in rows], default=0)
+    data = "".join(r.ljust(width) for r in rows).encode()
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(rows), width).copy()
+
+def from_string(text: str) -> "np.ndarray":
+    return from_rows(text.split("\n"))
+
+def to_rows(grid: "np.ndarray") -> List[str]:
+    return [row.tobytes().decode() for row in grid]
+
+def to_string(grid: "np.ndarray") -> str:
+    return "\n".join(to_rows(grid))
+
+def walls(grid: "np.ndarray") -> "np.ndarray":
+    return grid == ord(WALL)
+
+def floor(grid: "np.ndarray") -> "np.ndarray":
+    """ Every cell which is not a wall (including cells outside of the warehouse). """
+    return grid != ord(WALL)
+
+def targets(grid: "np.ndarray") -> "np.ndarray":
+    return np.isin(grid, _codes([TARGET, BOX_ON_TARGET, PLAYER_ON_TARGET, PLAYER_ON_TARGET2]))
+
+def boxes(grid: "np.ndarray") -> "np.ndarray":
+    return np.isin(grid, _codes([BOX, BOX_ON_TARGET]))
+
+def boxes_off_target(grid: "np.ndarray") -> int:
+    return int(np.count_nonzero(grid == ord(BOX)))
+
+def neighbour_counts(mask: "np.ndarray", diagonal: bool = False) -> "np.ndarray":
+    """
+        For every cell, how many of its 4 (or 8 with diagonal) neighbours are set in the mask.
+        Cells outside the board count as set, since they behave as walls.
+    """
+    padded = np.pad(mask.astype(np.uint8), 1, constant_values=1)
+    h, w = mask.shape
+    shifts = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    if diagonal: shifts += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+    counts = np.zeros(mask.shape, dtype=np.uint8)
+    for dy, dx in shifts: counts += padded[1 + dy:1 + dy + h, 1 + dx:1 + dx + w]
+    return counts
+
+def dead_corners(grid: "np.ndarray", inside: "np.ndarray" = None) -> "np.ndarray":
+    """ Mask of (interior) non-target cells with a wall both vertically and horizontally. """
+    padded = np.pad(walls(grid), 1, constant_values=True)
+    h, w = grid.shape
+    up, down = padded[0:h, 1:w + 1], padded[2:h + 2, 1:w + 1]
+    left, right = padded[1:h + 1, 0:w], padded[1:h + 1, 2:w + 2]
+    mask = (up | down) & (left | right) & floor(grid) & ~targets(grid)
+    return mask if inside is None else mask & inside
+
+def cells(mask: "np.ndarray") -> List[Cell]:
+    """ The (x, y) cells set in a mask. """
+    ys, xs = np.nonzero(mask)
+    return list(zip(xs.tolist(), ys.tolist()))
+
+def pad_to(grid: "np.ndarray", shape: Tuple[int, int]) -> "np.ndarray":
+    """ Pad a grid with BLANK on the bottom and right up to a (rows, cols) shape. """
+    h, w = grid.shape
+    return np.pad(grid, ((0, shape[0] - h), (0, shape[1] - w)), constant_values=ord(BLANK))
+
+def equal(a: "np.ndarray", b: "np.ndarray") -> bool:
+    return a.shape == b.shape and bool(np.array_equal(a, b))
+
+def diff_cells(a: "np.ndarray", b: "np.ndarray") -> List[Cell]:
+    """ The (x, y) cells that differ between two grids, padded to the same size. """
+    shape = (max(a.shape[0], b.shape[0]), max(a.shape[1], b.shape[1]))
+    return cells(pad_to(a, shape) != pad_to(b, shape))
@@ -0,0 +1,61 @@
+import ast
+from typing import Dict, List
+from components.globals import LEGAL_CHARS, WALL
+
+"""
+    Parsing of boards which are pasted as text, either in plain form or in
+    the repr form that the tools copy to the clipboard (i.e., '####\\n#@ #\\n####').
+"""
+
+# Deletes every legal character, so whatever is left over is illegal.
+# The NUL separator survives, so many boards can be checked in one translate call.
+_ILLEGAL_ONLY = str.maketrans('', '', "".join(LEGAL_CHARS) + "\n\r")
+_SEPARATOR = "\0"
+
+def board_lines(text: str) -> List[str]:
+    """ Split a single pasted board (in repr form with literal \\n, or plain) into rows. """
+    text = text.replace('\'', '').replace('"', '')
+    return text.split('\\n') if '\\n' in text else text.split('\n')
+
+def parse_board_block(text: str) -> List[str]:
+    """
+        Parse a block of pasted boards into a list of board strings.
+        The block can be a Python list (or tuple) of repr strings, a single repr
+        string, or one repr string per line (trailing commas are ignored).
+    """
+    text = text.strip()
+    try: value = ast.literal_eval(text)
+    except (ValueError, SyntaxError): value = None
+    if isinstance(value, str): return [value]
+    if isinstance(value, (list, tuple)) and all(isinstance(v, str) for v in value): return list(value)
+
+    boards = []
+    for line in text.splitlines():
+        line = line.strip().rstrip(',').strip()
+        if line in ("", "[", "]", "(", ")"): continue
+        try: value = ast.literal_eval(line)
+        except (ValueError, SyntaxError): value = line.replace('\\n', '\n')
+        if isinstance(value, str): boards.append(value)
+    return boards
+
+def without_weights(board: str) -> str:
+    """ A board string without its leading line of box weights (if it has one). """
+    first, _, rest = board.partition("\n")
+    if WALL not in first and first.split() and all(w.isdigit() for w in first.split()): return rest
+    return board
+
+def find_invalid(boards: List[str]) -> Dict[int, str]:
+    """
+        Validate many boards at once, returning {board index: error message}
+        for every invalid board. Illegal characters are found for every board
+        in a single str.translate pass over all of the boards joined together.
+        A leading line of box weights is allowed.
+    """
+    errors = {}
+    boards = [without_weights(board) for board in boards]
+    leftovers = _SEPARATOR.join(boards).translate(_ILLEGAL_ONLY).split(_SEPARATOR)
+    for i, (board, leftover) in enumerate(zip(boards, leftovers)):
+        if len(board) <= 1: errors[i] = "Invalid board."
+        elif WALL not in board: errors[i] = "No wall character found!"
+        elif leftover: errors[i] = f"Illegal char '{leftover[0]}' given."
+    return errors
@@ -0,0 +1,102 @@
+from collections import deque
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+from components.globals import WALL, BOX, BOX_ON_TARGET, DIRECTIONS
+
+"""
+    Path planning for macro moves on a board held as rows of characters
+    (indexed rows[y][x]), with cells as (x, y) tuples like Board.player.
+    Plans are returned as lists of direction names from globals.DIRECTIONS.
+"""
+
+Cell = Tuple[int, int]
+Rows = Sequence[Sequence[str]]
+
+MOVES = [(name, delta) for name, delta in DIRECTIONS.items()]
+
+def _free(rows: Rows, cell: Cell, boxes_blocking=True) -> bool:
+    x, y = cell
+    if not (0 <= y < len(rows) and 0 <= x < len(rows[y])): return False
+    c = rows[y][x]
+    return c != WALL and not (boxes_blocking and c in (BOX, BOX_ON_TARGET))
+
+def player_bfs(rows: Rows, start: Cell, vacated: Cell = None, moved: Cell = None) -> Dict[Cell, Tuple[Cell, str]]:
+    """
+        Breadth first search over every cell the player can walk to from start
+        without pushing anything. Returns {cell: (previous cell, direction)}.
+        Optionally the box at vacated is treated as having moved to moved.
+    """
+    tree = {start: (None, None)}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        for name, (dx, dy) in MOVES:
+            n = (cell[0] + dx, cell[1] + dy)
+            if n in tree or n == moved: continue
+            if n == vacated or _free(rows, n):
+                tree[n] = (cell, name); queue.append(n)
+    return tree
+
+def path_from_tree(tree: Dict[Cell, Tuple[Cell, str]], dest: Cell) -> Optional[List[str]]:
+    """ Walk back through a bfs tree to get the directions from its start to dest. """
+    if dest not in tree: return None
+    path = []
+    while tree[dest][0] != None:
+        dest, name = tree[dest]
+        path.append(name)
+    return path[::-1]
+
+class PathPlanner:
+    """
+        Plans macro moves for the player: walking to a cell, or pushing a box
+        to a cell. The player's bfs tree is cached, and is only recomputed
+        when the player moves or the version of the board changes (i.e., after a push or undo).
+    """
+    def __init__(self) -> None:
+        self.key: Tuple[Cell, Hashable] = None
+        self.tree: Dict[Cell, Tuple[Cell, str]] = {}
+
+    def reachable(self, rows: Rows, player: Cell, version: Hashable) -> Dict[Cell, Tuple[Cell, str]]:
+        """ Cached bfs tree of the player's reachable region. """
+        if self.key != (player, version):
+            self.key, self.tree = (player, version), player_bfs(rows, player)
+        return self.tree
+
+    def walk_to(self, rows: Rows, player: Cell, dest: Cell, version: Hashable) -> Optional[List[str]]:
+        """ Shortest walk to dest without pushing boxes, or None if unreachable. """
+        return path_from_tree(self.reachable(rows, player, version), dest)
+
+    def push_to(self, rows: Rows, player: Cell, box: Cell, dest: Cell, version: Hashable) -> Optional[List[str]]:
+        """
+            Plans pushes of a single box to dest, with the other boxes standing still.
+            Searches over (box, player) states using the fewest pushes, where the
+            player position is normalized to the side the box was last pushed from.
+            Returns the full list of walks and pushes, or None if it is impossible.
+        """
+        if box == dest: return []
+        if not _free(rows, dest, boxes_blocking=False): return None
+        start = (box, player)
+        parents = {start: (None, None)}
+        trees = {start: self.reachable(rows, player, version)}
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            current_box, _ = state
+            tree = trees.pop(state)
+            for name, (dx, dy) in MOVES:
+                behind = (current_box[0] - dx, current_box[1] - dy)
+                ahead = (current_box[0] + dx, current_box[1] + dy)
+                if behind not in tree: continue
+                if not (ahead == box or _free(rows, ahead)): continue
+                new_state = (ahead, current_box)
+                if new_state in parents: continue
+                parents[new_state] = (state, path_from_tree(tree, behind) + [name])
+                if ahead == dest:
+                    # Stitch the walks and pushes back together from the start state
+                    path = []
+                    while parents[new_state][0] != None:
+                        new_state, segment = parents[new_state]
+                        path = segment + path
+                    return path
+                trees[new_state] = player_bfs(rows, current_box, vacated=box, moved=ahead)
+                queue.append(new_state)
+        return None
@@ -0,0 +1,93 @@
+import os
+import struct
+import time
+from typing import Iterator, Optional, Tuple
+from components.cache import parse_cache
+
+"""
+    Compact recordings of manual play sessions, saved next to the warehouse
+    as <warehouse>.<start time>.skrec.
+
+    After a small header (magic, version, start time, and the content hash of the warehouse),
+    every event is a single byte: the low 3 bits are the event (Left, Up, Right, Down in
+    LURD order, or Undo), the high 5 bits are the time since the previous event in ticks
+    of 10ms. Longer pauses store 31 there, followed by the remaining ticks as a varint.
+    An hour of steady play is in the order of 10KB.
+
+    Sessions are read back lazily, events are decoded one at a time from the raw bytes.
+"""
+
+SESSION_EXT = ".skrec"
+UNDO = "Undo"
+EVENTS = ("Left", "Up", "Right", "Down", UNDO)
+TICK = 0.01 # seconds
+
+_MAGIC = b"SKRC"; _VERSION = 1
+_HEADER = struct.Struct("<4sBd20s")
+_CODES = {event: code for code, event in enumerate(EVENTS)}
+_LONG = 31
+
+class SessionRecorder:
+    """ Records the moves (and undos) of a manual session on a warehouse. """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.data = bytearray()
+        self.started: Optional[float] = None
+        self.last = 0.0
+        self.digest = b""
+
+    def record(self, event: str) -> None:
+        """ Append an event (a direction name, or UNDO), timestamped now. """
+        now = time.time()
+        if self.started == None:
+            self.started = self.last = now
+            self.digest = bytes.fromhex(parse_cache.hash_file(self.path))
+        ticks = max(0, int((now - self.last) / TICK))
+        self.last += ticks * TICK # keep the rounding error from adding up over long sessions
+        self.data.append(_CODES[event] | min(ticks, _LONG) << 3)
+        if ticks >= _LONG:
+            ticks -= _LONG
+            while ticks >= 0x80:
+                self.data.append(ticks & 0x7F | 0x80); ticks >>= 7
+            self.data.append(ticks)
+
+    def save(self) -> Optional[str]:
+        """ Write the session next to the warehouse, returning its path (None if nothing was recorded). """
+        if not self.data: return None
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        path = f"{os.path.splitext(self.path)[0]}.{stamp}{SESSION_EXT}"
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.started, self.digest))
+            f.write(self.data)
+        return path
+
+class Session:
+    """ A saved session, decoded lazily. """
+    def __init__(self, data: bytes) -> None:
+        if len(data) < _HEADER.size: raise ValueError("Not a session recording.")
+        magic, version, self.started, self.digest = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION: raise ValueError("Not a session recording.")
+        self.data = memoryview(data)[_HEADER.size:]
+
+    @classmethod
+    def load(cls, path: str) -> "Session":
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def matches(self, path: str) -> bool:
+        """ True if the session was recorded on the current content of a warehouse file. """
+        return self.digest.hex() == parse_cache.hash_file(path)
+
+    def events(self) -> Iterator[Tuple[float, str]]:
+        """ Yields (seconds since the previous event, event) in the order they were recorded. """
+        data, i = self.data, 0
+        while i < len(data):
+            byte = data[i]; i += 1
+            ticks = byte >> 3
+            if ticks == _LONG:
+                shift = 0
+                while True:
+                    b = data[i]; i += 1
+                    ticks += (b & 0x7F) << shift; shift += 7
+                    if b < 0x80: break
+            yield ticks * TICK, EVENTS[byte & 0x07]
@@ -0,0 +1,59 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+from components.cache import parse_cache
+from components.engine import Engine
+from components.globals import IMPOSSIBLE
+from components.sokoban import Warehouse
+
+"""
+    Scores action sequences by their cost, for checking cost-optimality test cases.
+    Every move costs 1, and pushing a box also costs the weight of that box.
+"""
+
+PARALLEL_THRESHOLD = 2000 # below this many sequences, worker processes cost more than they save
+
+def score(wh: Warehouse, moves: List[str]) -> Tuple[str, int]:
+    """ Replay moves headlessly, returning the final board (or IMPOSSIBLE) and the total cost. """
+    engine = Engine.from_warehouse(wh)
+    result = engine.replay(moves)
+    return result, engine.cost if result != IMPOSSIBLE else None
+
+def load_jobs(path: str, dir_path: str) -> List[dict]:
+    """
+        Load the sequences to score. The file is either in the sequences.json registry
+        format ({"wh_1.txt": {"name": [moves]}}), or a list of objects with "warehouse",
+        "actions", and optionally "name" and an expected "cost".
+        Warehouse filenames are relative to dir_path.
+    """
+    with open(path) as f:
+        content = json.load(f)
+    if isinstance(content, dict):
+        return [{"warehouse": wh, "name": name, "actions": moves}
+                for wh, sequences in content.items() for name, moves in sequences.items()]
+    return [{"name": str(i), **job} for i, job in enumerate(content)]
+
+def _score_batch(batch: Tuple[str, List[dict]]) -> List[dict]:
+    dir_path, jobs = batch
+    results = []
+    for job in jobs:
+        wh = parse_cache.load(os.path.join(dir_path, job["warehouse"]))
+        result, cost = score(wh, job["actions"])
+        entry = {"warehouse": job["warehouse"], "name": job["name"], 
+                 "impossible": result == IMPOSSIBLE, "cost": cost}
+        if "cost" in job: entry["expected_cost"], entry["ok"] = job["cost"], job["cost"] == cost
+        results.append(entry)
+    return results
+
+def score_jobs(jobs: List[dict], dir_path: str, workers: int = None) -> List[dict]:
+    """
+        Score every sequence. Jobs are grouped by warehouse so each file is parsed once
+        per process, and large batches are spread across worker processes.
+    """
+    jobs = sorted(jobs, key=lambda job: job["warehouse"])
+    if len(jobs) < PARALLEL_THRESHOLD: return _score_batch((dir_path, jobs))
+    size = max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))
+    batches = [(dir_path, jobs[i:i + size]) for i in range(0, len(jobs), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [entry for batch in pool.map(_score_batch, batches) for entry in batch]
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from components.cache import parse_cache
+from components.deadlock import taboo_cells
+from components.globals import DIRECTIONS, IMPOSSIBLE
+from components.scoring import score
+
+"""
+    Local HTTP/JSON service for verifying action sequences, so test harnesses
+    can check many sequences in one round trip instead of spawning the tool.
+
+    POST /verify with either one request object, a list of them, or {"requests": [...]}:
+        {"warehouse": "<warehouse text>", "actions": ["Up", "Left"], "taboo": true}
+    Each request gets back the final board (or "Impossible") and the total cost,
+    plus the taboo cells as [x, y] when "taboo" is true. A request which cannot be
+    checked gets back {"error": "..."} instead.
+    GET /health answers {"status": "ok"}.
+
+    Replays run in a pool of worker processes. Each worker keeps its own parse cache,
+    keyed by content hash, and requests are grouped by warehouse before being handed out.
+"""
+
+MAX_BODY = 64 * 1024 * 1024
+BATCH_SIZE = 256
+
+@lru_cache(maxsize=1024)
+def _taboo(text: str) -> List[List[int]]:
+    return sorted([x, y] for x, y in taboo_cells(parse_cache.from_text(text).as_array()))
+
+def verify(request: dict) -> dict:
+    """ Verify a single request, in whichever process it is called from. """
+    try:
+        text, actions = request["warehouse"], request["actions"]
+        if not isinstance(text, str) or not isinstance(actions, list): raise TypeError
+    except (KeyError, TypeError):
+        return {"error": "Expected a \"warehouse\" string and an \"actions\" list."}
+    unknown = [a for a in actions if not isinstance(a, str) or a not in DIRECTIONS]
+    if unknown: return {"error": f"Unknown action {unknown[0]!r}, expected one of {list(DIRECTIONS)}."}
+    try: wh = parse_cache.from_text(text.replace('\r\n', '\n'))
+    except (ValueError, IndexError): return {"error": "Invalid warehouse."}
+
+    result, cost = score(wh, actions)
+    response = {"result": result, "impossible": result == IMPOSSIBLE, "cost": cost}
+    if request.get("taboo"): response["taboo"] = _taboo(text.replace('\r\n', '\n'))
+    return response
+
+def _ready() -> bool:
+    """ A no-op, run once per worker so every worker process is started up front. """
+    return True
+
+def _verify_safely(request: dict) -> dict:
+    """ Verify a request, turning anything unexpected into an error for this request only. """
+    try: return verify(request)
+    except Exception as e: return {"error": f"Unable to verify: {type(e).__name__}: {e}"}
+
+def _verify_batch(requests: List[dict]) -> List[dict]:
+    return [_verify_safely(request) for request in requests]
+
+class VerificationService:
+    """ Asyncio HTTP server handing verification requests to a process pool. """
+    def __init__(self, host: str = "127.0.0.1", port: int = 8320, workers: int = None) -> None:
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """
+            Start the worker processes, then listen. The workers must exist before the server
+            socket does, otherwise forked workers inherit it (and any open connection),
+            and a closed connection never reaches EOF on the client.
+        """
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.pool, _ready) for _ in range(self.workers)])
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1] # the port chosen when given 0
+
+    async def serve_forever(self) -> None:
+        """ Serve until cancelled, then release the server and the worker processes. """
+        if self.server == None: await self.start()
+        try:
+            async with self.server: await self.server.serve_forever()
+        finally: self.close()
+
+    def close(self) -> None:
+        if self.server != None: self.server.close()
+        if self.pool != None: self.pool.shutdown(cancel_futures=True)
+        self.pool = None
+
+    async def verify_all(self, requests: List[dict]) -> List[dict]:
+        """
+            Verify many requests in the pool, returning the responses in request order.
+            Requests are sorted by warehouse text, so batches mostly share one parse.
+        """
+        order = sorted(range(len(requests)), key=lambda i: str(requests[i].get("warehouse", "")))
+        size = max(1, min(BATCH_SIZE, len(order) // self.workers))
+        batches = [order[i:i + size] for i in range(0, len(order), size)]
+        loop = asyncio.get_running_loop()
+        done = await asyncio.gather(*[
+            loop.run_in_executor(self.pool, _verify_batch, [requests[i] for i in batch])
+            for batch in batches
+        ])
+        responses: List[dict] = [None] * len(requests)
+        for batch, results in zip(batches, done):
+            for i, response in zip(batch, results): responses[i] = response
+        return responses
+
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[int, dict]:
+        """ Answer one HTTP request with a status code and a json body. """
+        if path == "/health" and method == "GET": return 200, {"status": "ok"}
+        if path != "/verify": return 404, {"error": f"Unknown path {path}."}
+        if method != "POST": return 405, {"error": "Use POST."}
+        try: content = json.loads(body or b"null")
+        except (json.JSONDecodeError, UnicodeDecodeError): return 400, {"error": "Body is not valid json."}
+
+        if isinstance(content, dict) and "requests" in content: content = content["requests"]
+        if isinstance(content, list):
+            requests = [request if isinstance(request, dict) else {} for request in content]
+            return 200, {"results": await self.verify_all(requests)}
+        if isinstance(content, dict): return 200, (await self.verify_all([content]))[0]
+        return 400, {"error": "Expected a request object or a list of requests."}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """ Serve HTTP/1.1 requests on one connection, keeping it alive between requests. """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                try: method, path, version = line.decode("latin-1").split()
+                except ValueError: await self.respond(writer, 400, {"error": "Bad request line."}, False); break
+
+                headers: Dict[str, str] = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""): break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY: await self.respond(writer, 413, {"error": "Body too large."}, False); break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                status, content = await self.route(method, path.split("?")[0], body)
+                await self.respond(writer, status, content, keep_alive)
+                if not keep_alive: break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError): pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer: asyncio.StreamWriter, status: int, content: dict, keep_alive: bool) -> None:
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+        body = json.dumps(content).encode()
+        head = (f"HTTP/1.1 {status} {reasons.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
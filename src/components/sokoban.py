@@ -1,5 +1,6 @@
-from typing import List, Tuple
-from components.globals import TARGET, PLAYER, BOX, WALL, PLAYER_ON_TARGET, BOX_ON_TARGET, X
+from typing import Dict, List, Tuple
+from components.globals import TARGET, PLAYER, BOX, WALL, PLAYER_ON_TARGET, PLAYER_ON_TARGET2, BOX_ON_TARGET, X, BLANK
+from components import npgrid
 
 """
     This class handles parsing .txt file warehouses.
@@ -76,7 +77,12 @@ class Warehouse:
             Iterate over each .txt line, and record coordinates of elements. 
             Make warehouse coordinates cannonical, where row 0 has at least 1 wall
             and col 0 has at least 1 wall.
+            A line of integers before the board gives the weights of the boxes,
+            in the same order as the boxes are recorded (row by row).
         """
+        for r in lines:
+            if '#' in r: break
+            if r.split() and all(w.isdigit() for w in r.split()): self.weights = [int(w) for w in r.split()]
         formatted_lines = [r.replace('\n', '') for r in lines if '#' in r]
         self.nrows = len(formatted_lines)
 
@@ -97,11 +103,15 @@ class Warehouse:
                 elif char == BOX: self.boxes.append((r, c))
                 elif char == TARGET: self.targets.append((r, c))
                 elif char == WALL: self.walls.append((r, c))
-                elif char == PLAYER_ON_TARGET: self.worker = (r, c); self.targets.append((r, c))
+                elif char in (PLAYER_ON_TARGET, PLAYER_ON_TARGET2): self.worker = (r, c); self.targets.append((r, c))
                 elif char == BOX_ON_TARGET: self.boxes.append((r, c)); self.targets.append((r, c))
                 elif char == X: self.taboo.append((r, c))
         self.ncols = max({cell[1] for cell in self.walls}) + 1
 
+    def box_weights(self) -> Dict[Tuple[int, int], int]:
+        """ Weight of the box at each box coordinate, boxes without a weight weigh 0. """
+        return {box: self.weights[i] if i < len(self.weights) else 0 for i, box in enumerate(self.boxes)}
+
     def as_array(self, walls_only=False) -> List[str]:
         """ 
             Return two dimensional array with warehouse elements added. 
@@ -122,6 +132,25 @@ class Warehouse:
             for taboo in self.taboo: insert(grid, taboo, X)
         return grid
 
+    def as_numpy(self) -> "npgrid.np.ndarray":
+        """
+            Return the board as a (rows, cols) uint8 array of the tile characters,
+            built with one scatter per element. Requires numpy (see npgrid.HAS_NUMPY).
+        """
+        np = npgrid.np
+        if np == None: raise ImportError("numpy is required for Warehouse.as_numpy")
+        grid = np.full((self.nrows, self.ncols), ord(BLANK), dtype=np.uint8)
+        def scatter(cells: List[Tuple[int, int]], char: str) -> None:
+            if cells: grid[tuple(np.array(cells).T)] = ord(char)
+        scatter(self.walls, WALL)
+        scatter(self.targets, TARGET)
+        targets = set(self.targets)
+        scatter(self.boxes, BOX)
+        scatter([b for b in self.boxes if b in targets], BOX_ON_TARGET)
+        if self.worker != None: grid[self.worker] = ord(PLAYER_ON_TARGET if self.worker in self.targets else PLAYER)
+        scatter(self.taboo, X)
+        return grid
+
     def __str__(self) -> str:
         """ Return a string representation of warehouse board. """
         return "\n".join(["".join(r) for r in self.as_array()])
@@ -0,0 +1,182 @@
+import curses
+import time
+from typing import Callable, Iterable, List, Set, Tuple
+from components.deadlock import taboo_cells
+from components.engine import Engine
+from components.globals import *
+from components.sokoban import Warehouse
+
+"""
+    Terminal (curses) front end, for using the tools where Tk is not available (i.e., over ssh).
+    Boards are drawn with the warehouse characters from globals.py onto a curses pad,
+    only the cells which changed are rewritten, and curses only sends what changed on screen.
+    The view scrolls to follow the player (or cursor), so boards larger than the terminal work.
+"""
+
+Cell = Tuple[int, int]
+
+FRAME_MS = 30
+KEYS = {
+    curses.KEY_UP: "Up", curses.KEY_DOWN: "Down", curses.KEY_LEFT: "Left", curses.KEY_RIGHT: "Right",
+    ord("w"): "Up", ord("s"): "Down", ord("a"): "Left", ord("d"): "Right",
+}
+_COLOURS = {WALL: curses.COLOR_BLUE, BOX: curses.COLOR_YELLOW, BOX_ON_TARGET: curses.COLOR_GREEN,
+            TARGET: curses.COLOR_RED, PLAYER: curses.COLOR_CYAN, PLAYER_ON_TARGET: curses.COLOR_CYAN,
+            PLAYER_ON_TARGET2: curses.COLOR_CYAN, X: curses.COLOR_MAGENTA}
+
+class Screen:
+    """ A scrolling view of a board, with a status line at the bottom of the terminal. """
+    def __init__(self, stdscr, width: int, height: int) -> None:
+        self.stdscr = stdscr
+        self.width, self.height = width, height
+        self.pad = curses.newpad(height + 1, width + 1)
+        self.top, self.left = 0, 0
+        self.attrs = {}
+        curses.curs_set(0)
+        stdscr.keypad(True)
+        if curses.has_colors():
+            curses.start_color(); curses.use_default_colors()
+            for i, (char, colour) in enumerate(_COLOURS.items()):
+                curses.init_pair(i + 1, colour, -1)
+                self.attrs[char] = curses.color_pair(i + 1) | curses.A_BOLD
+
+    def draw(self, char_at: Callable[[int, int], str], cells: Iterable[Cell] = None) -> None:
+        """ Write the given cells (every cell when None) onto the pad, using char_at(x, y). """
+        if cells == None: cells = ((x, y) for y in range(self.height) for x in range(self.width))
+        for x, y in cells:
+            char = char_at(x, y)
+            self.pad.addch(y, x, char, self.attrs.get(char, 0))
+
+    def mark(self, cell: Cell, on: bool) -> None:
+        """ Show (or stop showing) a cell in reverse video, i.e., as a cursor. """
+        x, y = cell
+        attr = self.attrs.get(chr(self.pad.inch(y, x) & 0xFF), 0)
+        self.pad.chgat(y, x, 1, attr | curses.A_REVERSE if on else attr)
+
+    def follow(self, cell: Cell) -> None:
+        """ Scroll so the cell is on screen, with a margin so there is room to move. """
+        rows, cols = self.view_size()
+        x, y = cell
+        margin_y, margin_x = min(3, rows // 4), min(6, cols // 4)
+        if y < self.top + margin_y: self.top = max(0, y - margin_y)
+        elif y >= self.top + rows - margin_y: self.top = min(max(0, self.height - rows), y - rows + margin_y + 1)
+        if x < self.left + margin_x: self.left = max(0, x - margin_x)
+        elif x >= self.left + cols - margin_x: self.left = min(max(0, self.width - cols), x - cols + margin_x + 1)
+
+    def scroll(self, dx: int, dy: int) -> None:
+        rows, cols = self.view_size()
+        self.top = max(0, min(self.top + dy, self.height - rows))
+        self.left = max(0, min(self.left + dx, self.width - cols))
+
+    def view_size(self) -> Tuple[int, int]:
+        rows, cols = self.stdscr.getmaxyx()
+        return max(1, rows - 1), max(1, cols)
+
+    def refresh(self, status: str) -> None:
+        """ Show the visible part of the pad and the status line, in a single update. """
+        rows, cols = self.view_size()
+        self.stdscr.move(rows, 0); self.stdscr.clrtoeol()
+        self.stdscr.addnstr(rows, 0, status, cols - 1, curses.A_REVERSE)
+        self.stdscr.noutrefresh()
+        self.pad.noutrefresh(self.top, self.left, 0, 0, rows - 1, cols - 1)
+        curses.doupdate()
+
+def visualize(stdscr, wh: Warehouse, name: str) -> None:
+    """ View a warehouse, scrolling with the arrow keys (q quits). """
+    grid = wh.as_array()
+    screen = Screen(stdscr, wh.ncols, wh.nrows); screen.draw(lambda x, y: grid[y][x])
+    while True:
+        screen.refresh(f" {name}  {wh.ncols}x{wh.nrows}  arrows: scroll  q: quit")
+        key = stdscr.getch()
+        if key in (ord("q"), 27): return
+        if key in KEYS: screen.scroll(*DIRECTIONS[KEYS[key]])
+
+def _moved(engine: Engine, before: int) -> Set[Cell]:
+    """ The cells changed by the last move, from where the player was before it. """
+    cells = {before, engine.player} | ({engine.last_push} if engine.last_push != None else set())
+    return {(i % engine.width, i // engine.width) for i in cells}
+
+def sequence(stdscr, wh: Warehouse, name: str, moves: List[str] = None) -> Tuple[List[str], str]:
+    """
+        Play a warehouse. Without moves, the player is moved with WASD/arrow keys (manual mode).
+        With moves they are played back: space plays/pauses, n steps, e skips to the end,
+        + and - change the speed. Returns the moves made and the final result when quitting.
+    """
+    engine = Engine.from_warehouse(wh)
+    char_at = lambda x, y: chr(engine.cells[y * engine.width + x])
+    screen = Screen(stdscr, engine.width, engine.height); screen.draw(char_at)
+    made, index, impossible, playing, speed = [], 0, False, False, 10.0
+    budget, last = 0.0, time.perf_counter()
+    stdscr.timeout(FRAME_MS)
+
+    def step(d: str) -> bool:
+        """ Apply one move, redrawing only the cells it changed. """
+        nonlocal impossible
+        before = engine.player
+        made.append(d)
+        if not engine.move(d):
+            impossible = True
+            return False
+        screen.draw(char_at, _moved(engine, before))
+        return True
+
+    while True:
+        if engine.player != None: screen.follow((engine.player % engine.width, engine.player // engine.width))
+        state = "Impossible!" if impossible else ""
+        if moves == None:
+            screen.refresh(f" {name}  moves {len(made)}  cost {engine.cost}  {state}  WASD/arrows: move  q: quit")
+        else:
+            screen.refresh(f" {name}  {index}/{len(moves)}  cost {engine.cost}  {speed:g} moves/s  {state}"
+                           f"  space: {'pause' if playing else 'play'}  n: step  e: end  +/-: speed  q: quit")
+
+        key = stdscr.getch()
+        if key in (ord("q"), 27): break
+        if moves == None:
+            if key in KEYS: step(KEYS[key])
+            continue
+
+        if key == ord(" "): playing, budget, last = not playing, 0.0, time.perf_counter()
+        elif key in (ord("+"), ord("=")): speed = min(speed * 2, 10000)
+        elif key == ord("-"): speed = max(speed / 2, 0.5)
+        steps = 1 if key == ord("n") else (len(moves) if key == ord("e") else 0)
+        if playing:
+            now = time.perf_counter()
+            budget += (now - last) * speed; last = now
+            steps = int(budget); budget -= steps
+        while steps and index < len(moves) and not impossible:
+            step(moves[index]); index += 1; steps -= 1
+        if index >= len(moves) or impossible: playing = False
+    return made, IMPOSSIBLE if impossible else str(engine)
+
+def taboo(stdscr, wh: Warehouse, name: str) -> str:
+    """
+        Mark taboo cells: move the cursor with WASD/arrow keys, space toggles the cell,
+        t marks every cell found by the taboo rules. Returns the board (walls and X) when quitting.
+    """
+    immutable = ["".join(r) for r in wh.as_array()]
+    grid = wh.as_array(walls_only=True)
+    screen = Screen(stdscr, wh.ncols, wh.nrows)
+    char_at = lambda x, y: grid[y][x]
+    screen.draw(char_at)
+    cursor = (wh.worker[1], wh.worker[0]) if wh.worker != None else (0, 0)
+
+    def toggle(cell: Cell, on: bool = None) -> None:
+        x, y = cell
+        if grid[y][x] == WALL or immutable[y][x] in INVAILD_TABOO_REPR_CHARS: return
+        grid[y][x] = X if (grid[y][x] != X if on == None else on) else BLANK
+        screen.draw(char_at, [cell])
+
+    while True:
+        screen.mark(cursor, True); screen.follow(cursor)
+        screen.refresh(f" {name}  taboo marking  WASD/arrows: move  space: toggle  t: mark computed  q: done")
+        key = stdscr.getch()
+        screen.mark(cursor, False)
+        if key in (ord("q"), 27): break
+        if key == ord(" "): toggle(cursor)
+        elif key == ord("t"):
+            for cell in taboo_cells(wh.as_array()): toggle(cell, on=True)
+        elif key in KEYS:
+            dx, dy = DIRECTIONS[KEYS[key]]
+            x, y = cursor[0] + dx, cursor[1] + dy
+            if 0 <= x < wh.ncols and 0 <= y < wh.nrows: cursor = (x, y)
+    return "\n".join("".join(r) for r in grid)
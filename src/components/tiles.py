@@ -0,0 +1,19 @@
+from PIL import Image
+from PIL import ImageTk
+from typing import Dict, Tuple
+from components.globals import IMAGES
+
+_cache: Dict[Tuple[str, int, bool], ImageTk.PhotoImage] = {}
+
+def tile_image(char: str, size: int = 35, highlight: bool = False) -> ImageTk.PhotoImage:
+    """
+        Returns the tile image for a warehouse character, opened and
+        resized only once per (char, size) and then shared by every tile.
+        Highlighted tiles are tinted red (i.e., to mark deadlocked boxes).
+    """
+    key = (char, size, highlight)
+    if key not in _cache:
+        img = Image.open(IMAGES[char]).convert("RGBA").resize((size, size))
+        if highlight: img = Image.blend(img, Image.new("RGBA", img.size, (255, 0, 0, 255)), 0.45)
+        _cache[key] = ImageTk.PhotoImage(img)
+    return _cache[key]
@@ -0,0 +1,143 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from components.cache import parse_cache
+from components.globals import *
+
+"""
+    Structural validation of warehouse files, catching what Warehouse.from_lines lets through:
+    illegal characters, a missing (or extra) player, box and target counts which differ,
+    borders the player can walk out of, and boxes or targets the player can never reach.
+
+    The board is checked as one flat bytearray, with a single scan for the counts
+    and a single flood fill from the player, so a file is checked in linear time.
+    Cells are reported as (x, y) in the same (trimmed) coordinates as the tools.
+"""
+
+BATCH_SIZE = 256
+ERROR = "error"; WARNING = "warning"
+
+_PLAYERS = {ord(PLAYER), ord(PLAYER_ON_TARGET), ord(PLAYER_ON_TARGET2)}
+_BOXES = {ord(BOX), ord(BOX_ON_TARGET)}
+_TARGETS = {ord(TARGET), ord(BOX_ON_TARGET), ord(PLAYER_ON_TARGET), ord(PLAYER_ON_TARGET2)}
+_LEGAL = {ord(c) for c in LEGAL_CHARS}
+_WALL = ord(WALL)
+
+# Memo of file content hash -> issues, so unchanged files are never validated twice
+_issues_by_content: Dict[str, List[dict]] = {}
+
+def _issue(severity: str, code: str, message: str, cells: List[Tuple[int, int]] = None) -> dict:
+    issue = {"severity": severity, "code": code, "message": message}
+    if cells: issue["cells"] = [list(cell) for cell in cells]
+    return issue
+
+def _board_lines(text: str) -> Tuple[List[str], Optional[List[int]]]:
+    """ The board rows (trimmed of leading columns without walls, as in from_lines), and any weights. """
+    lines = text.replace('\r\n', '\n').split('\n')
+    weights = None
+    for line in lines:
+        if WALL in line: break
+        if line.split() and all(w.isdigit() for w in line.split()): weights = [int(w) for w in line.split()]
+    rows = [line for line in lines if WALL in line]
+    if not rows: return rows, weights
+    shortest = min(len(r) for r in rows)
+    start = next((i for i in range(shortest) if any(r[i] == WALL for r in rows)), 0)
+    return [r[start:].rstrip() for r in rows], weights
+
+def validate_text(text: str) -> List[dict]:
+    """ Every structural issue of a warehouse's text, errors make the warehouse unusable. """
+    rows, weights = _board_lines(text)
+    if not rows: return [_issue(ERROR, "no-walls", "No wall character found!")]
+    width, height = max(len(r) for r in rows), len(rows)
+    board = "".join(r.ljust(width) for r in rows)
+    cells = bytearray(board.encode("ascii", "replace")) # non ascii characters become '?', also illegal
+    xy = lambda i: (i % width, i // width)
+
+    # One scan for the illegal characters and the counts
+    issues, players, boxes, targets, illegal = [], [], [], 0, []
+    for i, c in enumerate(cells):
+        if c == _WALL: continue
+        if c not in _LEGAL: illegal.append(i)
+        elif c in _PLAYERS: players.append(i)
+        if c in _BOXES: boxes.append(i)
+        if c in _TARGETS: targets += 1
+    if illegal:
+        issues.append(_issue(ERROR, "illegal-char", f"Illegal char '{board[illegal[0]]}' given.",
+                             [xy(i) for i in illegal]))
+    if not players: issues.append(_issue(ERROR, "no-player", "No player found."))
+    elif len(players) > 1:
+        issues.append(_issue(ERROR, "many-players", f"{len(players)} players found.", [xy(i) for i in players]))
+    if len(boxes) != targets:
+        issues.append(_issue(ERROR, "box-target-count", f"{len(boxes)} box(es) but {targets} target(s)."))
+    elif not boxes: issues.append(_issue(WARNING, "no-boxes", "No boxes, the warehouse is already solved."))
+    if weights != None and len(weights) != len(boxes):
+        issues.append(_issue(WARNING, "weights", f"{len(weights)} weight(s) given for {len(boxes)} box(es)."))
+    if X in board: issues.append(_issue(WARNING, "taboo-marks", "Taboo marks (X) in the warehouse file."))
+    if not players: return issues
+
+    # One flood fill from the player, over everything but walls (boxes can be moved)
+    seen = bytearray(len(cells))
+    stack, escapes = [players[0]], []
+    seen[players[0]] = 1
+    while stack:
+        i = stack.pop()
+        x, y = i % width, i // width
+        if x == 0 or y == 0 or x == width - 1 or y == height - 1: escapes.append(i)
+        for n, ok in ((i - 1, x > 0), (i + 1, x < width - 1), (i - width, y > 0), (i + width, y < height - 1)):
+            if ok and not seen[n] and cells[n] != _WALL:
+                seen[n] = 1; stack.append(n)
+    if escapes:
+        issues.append(_issue(ERROR, "open-border", "The player can walk out of the warehouse.",
+                             sorted(xy(i) for i in escapes)))
+    unreachable = [i for i in boxes if not seen[i]]
+    if unreachable:
+        issues.append(_issue(ERROR, "unreachable-box", f"{len(unreachable)} box(es) the player can never reach.",
+                             [xy(i) for i in unreachable]))
+    lost = [i for i, c in enumerate(cells) if c in _TARGETS and not seen[i]]
+    if lost:
+        issues.append(_issue(ERROR, "unreachable-target", f"{len(lost)} target(s) the player can never reach.",
+                             [xy(i) for i in lost]))
+    return issues
+
+def is_valid(issues: List[dict]) -> bool:
+    return all(issue["severity"] != ERROR for issue in issues)
+
+def blocking_issues(issues: List[dict], needs_player: bool = False) -> List[dict]:
+    """
+        The issues which stop the tools from loading a warehouse at all (other errors, i.e.,
+        an open border, still load). Playing (the Sequence tool) also needs a player.
+    """
+    codes = {"no-walls", "no-player"} if needs_player else {"no-walls"}
+    return [issue for issue in issues if issue["code"] in codes]
+
+def _validate_batch(texts: List[str]) -> List[List[dict]]:
+    return [validate_text(text) for text in texts]
+
+def validate_dir(dir_path: str, filenames: List[str] = None, workers: int = None) -> Dict[str, List[dict]]:
+    """
+        Issues of every given file (by default every .txt file) in a directory. Files are keyed
+        by content hash (using the parse cache, which skips unchanged files), so each distinct
+        content is only validated once. Large collections are validated in batches across worker processes,
+        unless workers is 1: then everything runs in the calling thread (as the main window does, since
+        forking its multi-threaded Tk process for a pool is unsafe).
+    """
+    if filenames == None: filenames = [f for f in os.listdir(dir_path) if f.split('.')[-1] == "txt"]
+    by_content = {name: parse_cache.hash_file(os.path.join(dir_path, name)) for name in filenames}
+    todo = {}
+    for name, digest in by_content.items():
+        if digest not in _issues_by_content and digest not in todo: todo[digest] = name
+
+    if todo:
+        digests = list(todo)
+        texts = []
+        for digest in digests:
+            with open(os.path.join(dir_path, todo[digest]), 'rb') as f:
+                texts.append(f.read().decode("utf-8", "replace"))
+        batches = [texts[i:i + BATCH_SIZE] for i in range(0, len(texts), BATCH_SIZE)]
+        if len(batches) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = [issues for batch in pool.map(_validate_batch, batches) for issues in batch]
+        else: results = [issues for batch in batches for issues in _validate_batch(batch)]
+        _issues_by_content.update(zip(digests, results))
+
+    return {name: _issues_by_content[digest] for name, digest in by_content.items()}
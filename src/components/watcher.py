@@ -0,0 +1,80 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+from typing import Dict, Set, Tuple
+
+"""
+    Watches a warehouse directory for created, removed and modified .txt files.
+    Uses inotify where it is available (Linux), otherwise falls back to polling
+    the mtime and size of each file with os.scandir.
+
+    The watcher never blocks, poll() is meant to be called periodically
+    (i.e., with root.after) and returns the names of the files that changed.
+"""
+
+_IN_MODIFY = 0x002; _IN_CLOSE_WRITE = 0x008; _IN_MOVED_FROM = 0x040; _IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100; _IN_DELETE = 0x200; _IN_Q_OVERFLOW = 0x4000
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+def _is_warehouse(name: str) -> bool:
+    return name.split('.')[-1] == "txt"
+
+class DirectoryWatcher:
+    """ Reports changed .txt files in a directory, with inotify or mtime polling. """
+    def __init__(self, dir_path: str) -> None:
+        self.dir_path = dir_path
+        self.fd = None
+        self.snapshot: Dict[str, Tuple[int, int]] = {}
+        try: self._start_inotify()
+        except (OSError, AttributeError, TypeError): self.fd = None
+        if self.fd == None: self.snapshot = self._scan()
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self.fd != None
+
+    def _start_inotify(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK)
+        if fd < 0: return
+        if libc.inotify_add_watch(fd, os.fsencode(self.dir_path), _IN_MASK) < 0:
+            os.close(fd)
+            return
+        self.fd = fd
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """ The (mtime, size) of every .txt file in the directory. """
+        snapshot = {}
+        with os.scandir(self.dir_path) as entries:
+            for entry in entries:
+                if _is_warehouse(entry.name) and entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self) -> Set[str]:
+        """ Names of the .txt files created, removed or modified since the last poll. """
+        if self.fd == None:
+            previous, self.snapshot = self.snapshot, self._scan()
+            return {name for name in previous.keys() | self.snapshot.keys()
+                    if previous.get(name) != self.snapshot.get(name)}
+
+        changed = set()
+        while True:
+            try: data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError: break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+                # The event queue overflowed, so any file could have changed
+                if mask & _IN_Q_OVERFLOW: changed.update(os.listdir(self.dir_path))
+                elif name: changed.add(os.fsdecode(name))
+        return {name for name in changed if _is_warehouse(name)}
+
+    def close(self) -> None:
+        if self.fd != None: os.close(self.fd)
+        self.fd = None
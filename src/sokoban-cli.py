@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import sys
+import time
+from components.diff import load_pairs, diff_report
+from components.fixtures import export_fixtures, write_json, write_pytest, SEQUENCES_JSON
+from components.canonical import duplicate_groups
+from components.scoring import load_jobs, score_jobs
+from components.fuzz import fuzz
+from components.validate import validate_dir, is_valid, ERROR
+
+"""
+    Headless command line tools, for working with warehouses and
+    test results without opening any windows.
+
+    Usage: python sokoban-cli.py <command> --help
+"""
+
+def run_diff(args: argparse.Namespace) -> int:
+    """ Diff every (expected, actual) pair in a results file, and report the mismatches. """
+    start = time.perf_counter()
+    report = diff_report(load_pairs(args.results))
+    mismatches = [entry for entry in report if not entry["equal"]]
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report if args.all else mismatches, f, indent=4)
+    else:
+        for entry in mismatches:
+            if "cells" in entry:
+                print(f"{entry['name']}: {len(entry['cells'])} cell(s) differ, "
+                      f"missing boxes {entry['missing_boxes']}, unexpected boxes {entry['extra_boxes']}, "
+                      f"player {entry['expected_player']} -> {entry['actual_player']}")
+            else: print(f"{entry['name']}: expected {entry['expected_text']!r}, got {entry['actual_text']!r}")
+    print(f"{len(mismatches)} of {len(report)} pair(s) differ ({time.perf_counter() - start:.2f}s).")
+    return 1 if mismatches else 0
+
+def default_dir() -> str:
+    """ The warehouse directory chosen in the main window (see Properties.dir_path). """
+    from components.properties import Properties
+    return Properties().dir_path
+
+def run_export(args: argparse.Namespace) -> int:
+    """ Export test fixtures for every warehouse in a directory, recomputing only changed ones. """
+    start = time.perf_counter()
+    fixtures, recomputed, skipped = export_fixtures(args.dir or default_dir(), workers=args.workers)
+    if args.out.endswith(".py"): write_pytest(fixtures, args.out)
+    else: write_json(fixtures, args.out)
+    print(f"Exported {len(fixtures)} warehouse(s) to {args.out}, "
+          f"{recomputed} recomputed ({time.perf_counter() - start:.2f}s).")
+    for fixture in skipped: print(f"Skipped {fixture['warehouse']}: {fixture['error']}")
+    return 0
+
+def run_dedup(args: argparse.Namespace) -> int:
+    """ Report every group of warehouses which are the same up to symmetry and padding. """
+    start = time.perf_counter()
+    dir_path = args.dir or default_dir()
+    groups = duplicate_groups(dir_path, workers=args.workers)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(groups, f, indent=4)
+    else:
+        for group in groups: print(", ".join(group))
+    duplicates = sum(len(group) - 1 for group in groups)
+    print(f"{duplicates} duplicate(s) in {len(groups)} group(s) ({time.perf_counter() - start:.2f}s).")
+    return 0
+
+def run_score(args: argparse.Namespace) -> int:
+    """ Score the cost of many sequences, checking them against any expected costs. """
+    start = time.perf_counter()
+    dir_path = args.dir or default_dir()
+    jobs = load_jobs(args.sequences or os.path.join(dir_path, SEQUENCES_JSON), dir_path)
+    results = score_jobs(jobs, dir_path, workers=args.workers)
+    failures = [r for r in results if r.get("ok") == False]
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+    else:
+        for r in results:
+            cost = "Impossible" if r["impossible"] else r["cost"]
+            check = "" if "ok" not in r else (" ok" if r["ok"] else f" expected {r['expected_cost']}")
+            print(f"{r['warehouse']} {r['name']}: {cost}{check}")
+    print(f"Scored {len(results)} sequence(s), {len(failures)} cost mismatch(es) "
+          f"({time.perf_counter() - start:.2f}s).")
+    return 1 if failures else 0
+
+def run_fuzz(args: argparse.Namespace) -> int:
+    """ Fuzz the Board move rules against the headless Engine, reporting minimal divergences. """
+    report = fuzz(args.dir or default_dir(), sequences=args.sequences, length=args.length,
+                  workers=args.workers, seed=args.seed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=4)
+    for d in report["divergences"]: print(f"{d['warehouse']}: {d['reason']}, reproduce with {d['moves']!r}")
+    print(f"{report['sequences']} sequence(s) in {report['seconds']:.2f}s ({report['per_second']:.0f}/s), "
+          f"{len(report['divergences'])} divergence(s), seed {report['seed']}.")
+    return 1 if report["divergences"] else 0
+
+def run_lint(args: argparse.Namespace) -> int:
+    """ Validate the structure of every warehouse in a directory. """
+    start = time.perf_counter()
+    report = validate_dir(args.dir or default_dir(), workers=args.workers)
+    if not args.warnings: 
+        report = {name: [issue for issue in issues if issue["severity"] == ERROR] for name, issues in report.items()}
+    report = {name: issues for name, issues in sorted(report.items()) if issues}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=4)
+    else:
+        for name, issues in report.items():
+            for issue in issues: print(f"{name}: {issue['severity']} {issue['code']}: {issue['message']}")
+    invalid = sum(1 for issues in report.values() if not is_valid(issues))
+    print(f"{invalid} invalid warehouse(s), {len(report)} with issues ({time.perf_counter() - start:.2f}s).")
+    return 1 if invalid else 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="sokoban-cli", description="Headless Sokoban tool commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    diff = commands.add_parser("diff", help="Diff expected vs actual boards from a results file.")
+    diff.add_argument("results", help="json or json lines file of [expected, actual] pairs.")
+    diff.add_argument("--json", help="Write the report to this json file instead of printing it.")
+    diff.add_argument("--all", action="store_true", help="Include matching pairs in the json report.")
+    diff.set_defaults(run=run_diff)
+
+    export = commands.add_parser("export", help="Export taboo, board and sequence result fixtures.")
+    export.add_argument("--dir", help="Warehouse directory, defaults to the one chosen in the main window.")
+    export.add_argument("--out", default="fixtures.json", help="Output file, .json or .py (pytest parametrize).")
+    export.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    export.set_defaults(run=run_export)
+
+    dedup = commands.add_parser("dedup", help="Report duplicate warehouses (up to rotation, reflection, padding).")
+    dedup.add_argument("--dir", help="Warehouse directory, defaults to the one chosen in the main window.")
+    dedup.add_argument("--json", help="Write the duplicate groups to this json file instead of printing them.")
+    dedup.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    dedup.set_defaults(run=run_dedup)
+
+    score = commands.add_parser("score", help="Score the total cost (with box weights) of many sequences.")
+    score.add_argument("sequences", nargs="?", help="Sequences json, defaults to the directory's sequences.json.")
+    score.add_argument("--dir", help="Warehouse directory, defaults to the one chosen in the main window.")
+    score.add_argument("--json", help="Write the scores to this json file instead of printing them.")
+    score.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    score.set_defaults(run=run_score)
+
+    fuzzer = commands.add_parser("fuzz", help="Fuzz the Board move rules against the headless engine.")
+    fuzzer.add_argument("--dir", help="Warehouse directory, defaults to the one chosen in the main window.")
+    fuzzer.add_argument("--sequences", type=int, default=100000, help="Number of action sequences to run.")
+    fuzzer.add_argument("--length", type=int, default=60, help="Maximum length of a random sequence.")
+    fuzzer.add_argument("--seed", type=int, default=None, help="Seed, to reproduce an earlier run.")
+    fuzzer.add_argument("--json", help="Also write the report to this json file.")
+    fuzzer.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    fuzzer.set_defaults(run=run_fuzz)
+
+    lint = commands.add_parser("lint", help="Validate the structure of every warehouse in a directory.")
+    lint.add_argument("--dir", help="Warehouse directory, defaults to the one chosen in the main window.")
+    lint.add_argument("--json", help="Write the issues to this json file instead of printing them.")
+    lint.add_argument("--warnings", action="store_true", help="Also report warnings, not only errors.")
+    lint.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    lint.set_defaults(run=run_lint)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
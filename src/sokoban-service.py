@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+import multiprocessing
+import sys
+from components.service import VerificationService
+
+"""
+    Local verification service for test harnesses, see components/service.py
+    for the request format.
+
+    Usage: python sokoban-service.py [--host 127.0.0.1] [--port 8320] [--workers N]
+"""
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="sokoban-service", description="HTTP/JSON action sequence verification.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8320, help="Port to listen on (0 picks a free port).")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    args = parser.parse_args(argv)
+
+    service = VerificationService(args.host, args.port, args.workers)
+    async def serve() -> None:
+        await service.start()
+        print(f"Verifying on http://{service.host}:{service.port}/verify with {service.workers} worker(s).", flush=True)
+        await service.serve_forever()
+    try: asyncio.run(serve())
+    except KeyboardInterrupt: pass
+    return 0
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support() # worker processes in a packaged .exe
+    sys.exit(main())
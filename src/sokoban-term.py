@@ -0,0 +1,68 @@
+import argparse
+import os
+import sys
+from components.cache import parse_cache
+from components.fixtures import load_sequences
+from components.globals import DIRECTIONS
+
+"""
+    Terminal front end, for when Tk is not available (i.e., over ssh).
+
+    Usage: python sokoban-term.py <warehouse.txt> [--mode visualize|sequence|taboo]
+                                  [--moves FILE | --sequence NAME]
+
+    Sequence mode without moves is manual play, with moves (a file holding a list of
+    actions, or a sequence registered in the Sequence tool) they are played back.
+    When quitting, the moves and result (Sequence) or the taboo board (Taboo) are printed
+    in the same repr form the tools copy to the clipboard.
+"""
+
+def parse_moves(text: str) -> list:
+    """ Actions from text such as ['Up', 'Left'] or Up, Left (the form the Sequence tool accepts). """
+    for char in ["\n", " ", "[", "]", "\"", "\'"]: text = text.replace(char, "")
+    moves = [move for move in text.split(",") if move]
+    invalid = [move for move in moves if move not in DIRECTIONS]
+    if invalid: raise ValueError(f"Invalid action -> {invalid[0]}")
+    return moves
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="sokoban-term", description="Terminal Sokoban tool.")
+    parser.add_argument("warehouse", help="Warehouse .txt file.")
+    parser.add_argument("--mode", choices=["visualize", "sequence", "taboo"], default="visualize")
+    parser.add_argument("--moves", help="File of actions to play back (sequence mode).")
+    parser.add_argument("--sequence", help="Name of a registered sequence to play back (sequence mode).")
+    args = parser.parse_args(argv)
+
+    try: import curses
+    except ImportError:
+        print("The terminal front end needs curses (on Windows: pip install windows-curses).")
+        return 1
+    from components import terminal
+
+    wh = parse_cache.load(args.warehouse)
+    name = os.path.basename(args.warehouse).split(".txt")[0]
+    moves = None
+    try:
+        if args.moves:
+            with open(args.moves) as f:
+                moves = parse_moves(f.read())
+        elif args.sequence:
+            registered = load_sequences(os.path.dirname(os.path.abspath(args.warehouse)))
+            moves = parse_moves(repr(registered[os.path.basename(args.warehouse)][args.sequence]))
+    except KeyError:
+        print(f"No sequence named {args.sequence} is registered for {name}.")
+        return 1
+    except ValueError as e:
+        print(e)
+        return 1
+
+    if args.mode == "visualize": curses.wrapper(terminal.visualize, wh, name)
+    elif args.mode == "taboo": print(repr(curses.wrapper(terminal.taboo, wh, name)))
+    else:
+        made, result = curses.wrapper(terminal.sequence, wh, name, moves)
+        print(repr(made))
+        print(repr(result))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
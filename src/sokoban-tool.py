@@ -1,12 +1,27 @@
 import tkinter as tk
+from tkinter import messagebox
+import multiprocessing
 import os
+from concurrent.futures import ThreadPoolExecutor
 from components.properties import Properties
-from components.globals import VISUALIZE, TABOO, SEQUENCE, H1
+from components.canonical import canonical_hashes
+from components.watcher import DirectoryWatcher
+from components.validate import validate_dir, is_valid, blocking_issues
+from components.globals import VISUALIZE, TABOO, SEQUENCE, H1, WAREHOUSE_CHANGED
 from windows.visualize import Visualize
 from windows.taboo import Taboo
 from windows.sequence import Sequence
 from windows.pasteboard import PasteBoard
 from windows.buildboard import BuildBoard
+from windows.diffboard import DiffBoard
+from windows.compare import Compare
+from windows.manager import WindowManager
+
+DEBOUNCE_MS = 300; INOTIFY_POLL_MS = 250; MTIME_POLL_MS = 1000; INDEX_POLL_MS = 100
+
+def index_files(dir_path: str, filenames: list) -> tuple:
+    """ The issues and canonical hashes of files, computed in the calling thread (no process pool). """
+    return validate_dir(dir_path, filenames, workers=1), canonical_hashes(dir_path, filenames, workers=1)
 
 class App:
     """
@@ -21,13 +36,23 @@ class App:
         3. Sequence: users can play a Sokoban game, or paste in a list of actions to watch.
         4. Paste Board: users can paste a string Sokoban, and visualize it.
         5. Build Board: users can create a new board to add to the list of warehouses.
+        6. Diff Boards: users can paste an expected and an actual board, and see where they differ.
+        7. Compare: users can replay many registered sequences side by side, in step.
 
         To create .exe: pyinstaller --onefile --windowed --add-data "assets;assets" sokoban-tool.py
         Please read the README.md for more general details.
     """
     def __init__(self) -> None:
         self.properties: Properties = Properties()
+        self.watcher: DirectoryWatcher = None
+        self.pending_changes = set()
+        self.issues = {} # filename -> structural issues, found when the directory is indexed
+        self.hashes = {} # filename -> canonical hash, for hiding duplicates
+        self.indexer = ThreadPoolExecutor(max_workers=1) # indexes off the Tk thread, one batch of files at a time
+        self.debounce = None
         self.root: tk.Tk = tk.Tk()
+        self.manager = WindowManager(self.root) # every tool window runs on this root's mainloop
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
         self.root.focus_force()
         self.root.title("SKBN")
         self.header = tk.Frame(self.root).pack(side=tk.TOP, fill=tk.X)
@@ -37,8 +62,16 @@ class App:
         self.set_searchbar()
         self.set_options()
         self.set_listbox()
+        self.poll_watcher()
         self.root.mainloop()
 
+    def quit(self) -> None:
+        """ Close every tool window (so each can release its resources), then the app. """
+        self.manager.close_all()
+        if self.watcher != None: self.watcher.close()
+        self.indexer.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+
     def set_logo(self) -> None:
         """ Sets the tkinter window logo to icon.ico. """
         try: 
@@ -51,7 +84,10 @@ class App:
         search = tk.Frame(self.header)
         self.search_var = tk.StringVar()
         self.search_var.trace_add("write", self.on_update_searchbar)
+        self.hide_duplicates = tk.BooleanVar(value=False)
         tk.Label(search, text='Filter: ').pack(side=tk.LEFT)
+        tk.Checkbutton(search, text="Hide duplicates", variable=self.hide_duplicates,
+                       command=lambda: self.on_update_searchbar(None, None, None)).pack(side=tk.RIGHT)
         tk.Entry(search, textvariable=self.search_var).pack(side=tk.TOP, fill=tk.X)
         search.pack(side=tk.TOP, fill=tk.X)
 
@@ -59,10 +95,19 @@ class App:
         """ 
             Updates listbox, when searchbar is modified, 
             to only show searched Sokoban games by their name. 
+            If hiding duplicates, only the first of each group of warehouses that
+            are the same up to rotation, reflection and padding is shown (using the
+            hashes found when indexing, files not hashed yet are always shown).
         """
         self.current_warehouses = [
             wh for wh in self.warehouses 
             if wh[:len(self.search_var.get())]==self.search_var.get()]
+        if self.hide_duplicates.get():
+            seen = set()
+            key = lambda wh: self.hashes.get(wh, wh)
+            self.current_warehouses = [
+                wh for wh in sorted(self.current_warehouses) 
+                if key(wh) not in seen and not seen.add(key(wh))]
         self.update_listbox()
 
     def set_options(self) -> None:
@@ -76,8 +121,11 @@ class App:
         tk.Radiobutton(options, text="Visualize", variable=self.options_var, value=VISUALIZE).pack(side=tk.TOP, anchor=tk.NW, padx=10, pady=(10,0))
         tk.Radiobutton(options, text="Taboo", variable=self.options_var, value=TABOO).pack(side=tk.TOP, anchor=tk.NW, padx=10)
         tk.Radiobutton(options, text="Sequence", variable=self.options_var, value=SEQUENCE).pack(side=tk.TOP, anchor=tk.NW, padx=10)
-        tk.Button(options, text="Paste Board", command=lambda: PasteBoard(tk.Toplevel(self.root))).pack(side=tk.BOTTOM, fill=tk.X)
-        tk.Button(options, text="Build Board", command=lambda: BuildBoard(tk.Toplevel(self.root))).pack(side=tk.BOTTOM, fill=tk.X)
+        tk.Button(options, text="Paste Board", command=lambda: self.manager.open(PasteBoard)).pack(side=tk.BOTTOM, fill=tk.X)
+        tk.Button(options, text="Build Board", command=lambda: self.manager.open(BuildBoard)).pack(side=tk.BOTTOM, fill=tk.X)
+        tk.Button(options, text="Diff Boards", command=lambda: self.manager.open(DiffBoard)).pack(side=tk.BOTTOM, fill=tk.X)
+        tk.Button(options, text="Compare", 
+                  command=lambda: self.manager.open(Compare, self.properties.dir_path)).pack(side=tk.BOTTOM, fill=tk.X)
         options.pack(side=tk.LEFT, fill=tk.Y)
 
     def set_listbox(self) -> None:
@@ -91,6 +139,8 @@ class App:
         self.listbox.bind("<Double-1>", self.click_event_listbox)
         self.update_warehouses()
         self.listbox.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.watch_status = tk.StringVar()
+        tk.Label(listing, textvariable=self.watch_status, fg="red").pack(side=tk.TOP, fill=tk.X)
         tk.Button(self.header, text="Change Folder", 
                   command=lambda:self.update_warehouses(new_dir=True)
                   ).pack(side=tk.BOTTOM, fill=tk.X)
@@ -107,8 +157,91 @@ class App:
         self.warehouses = self.current_warehouses = [
             wh for wh in os.listdir(self.properties.dir_path) 
             if wh.split('.')[-1] == "txt"]
+        self.issues, self.hashes = {}, {}
         self.on_update_searchbar(None, None, None)
+        self.index(self.warehouses)
         self.update_listbox()
+        if self.watcher == None or self.watcher.dir_path != self.properties.dir_path:
+            if self.watcher != None: self.watcher.close()
+            self.watcher = DirectoryWatcher(self.properties.dir_path)
+
+    def poll_watcher(self) -> None:
+        """
+            Periodically collects changed .txt files from the directory watcher.
+            Changes are debounced, so a burst of events (i.e., an editor saving)
+            is only applied once things have been quiet for DEBOUNCE_MS.
+        """
+        interval = INOTIFY_POLL_MS if self.watcher.uses_inotify else MTIME_POLL_MS
+        self.root.after(interval, self.poll_watcher) # re-armed first, so a failed poll never stops watching
+        try: changed = self.watcher.poll()
+        except OSError as e: # i.e., the directory was removed or unmounted
+            self.watch_status.set(f"Unable to watch the folder: {e.strerror or e}")
+            return
+        self.watch_status.set("")
+        if changed:
+            self.pending_changes |= changed
+            if self.debounce != None: self.root.after_cancel(self.debounce)
+            self.debounce = self.root.after(DEBOUNCE_MS, self.apply_changes)
+
+    def apply_changes(self) -> None:
+        """
+            Applies debounced file changes to the listbox incrementally:
+            new files are inserted, removed files are deleted, and any open
+            Visualize or Sequence window of a modified file is offered a reload.
+            New and modified files are indexed again, and their entries re-marked.
+        """
+        self.debounce = None
+        changed, self.pending_changes = self.pending_changes, set()
+        search = self.search_var.get()
+        for wh in sorted(changed):
+            path = self.properties.dir_path + "/" + wh
+            exists = os.path.isfile(path)
+            if exists and wh not in self.warehouses:
+                self.warehouses.append(wh)
+                if wh[:len(search)] == search and not self.hide_duplicates.get():
+                    self.current_warehouses.append(wh)
+                    self.listbox.insert(tk.END, wh.split(".txt")[0])
+                    self.mark_listbox(len(self.current_warehouses) - 1, wh)
+            elif not exists and wh in self.warehouses:
+                self.warehouses.remove(wh)
+                self.issues.pop(wh, None); self.hashes.pop(wh, None)
+                if wh in self.current_warehouses:
+                    self.listbox.delete(self.current_warehouses.index(wh))
+                    self.current_warehouses.remove(wh)
+            elif exists: 
+                if wh in self.current_warehouses: self.mark_listbox(self.current_warehouses.index(wh), wh)
+                self.notify_changed(path)
+        self.index([wh for wh in changed if wh in self.warehouses])
+        if self.hide_duplicates.get(): self.on_update_searchbar(None, None, None)
+
+    def index(self, filenames) -> None:
+        """
+            Validates and hashes files in the background (so large directories don't freeze
+            the window), then marks their listbox entries once the results are in.
+        """
+        if not filenames: return
+        dir_path = self.properties.dir_path
+        future = self.indexer.submit(index_files, dir_path, list(filenames))
+        self.root.after(INDEX_POLL_MS, self.collect_index, future, dir_path)
+
+    def collect_index(self, future, dir_path: str) -> None:
+        """ Marks the listbox entries of indexed files, waiting until the indexing is done. """
+        if not future.done():
+            self.root.after(INDEX_POLL_MS, self.collect_index, future, dir_path)
+            return
+        if dir_path != self.properties.dir_path or future.exception() != None: return # directory changed
+        issues, hashes = future.result()
+        issues = {wh: found for wh, found in issues.items() if wh in self.warehouses}
+        self.issues.update(issues)
+        self.hashes.update((wh, digest) for wh, digest in hashes.items() if wh in self.warehouses)
+        if self.hide_duplicates.get(): self.on_update_searchbar(None, None, None)
+        else:
+            for i, wh in enumerate(self.current_warehouses):
+                if wh in issues: self.mark_listbox(i, wh)
+
+    def notify_changed(self, path: str) -> None:
+        """ Tell any open window of a warehouse that its file changed. """
+        for window in self.manager.windows_for(path): window.event_generate(WAREHOUSE_CHANGED)
 
     def update_listbox(self) -> None:
         """
@@ -120,6 +253,13 @@ class App:
         for i, filename in enumerate(self.current_warehouses):
             name = filename.split(".txt")[0]
             self.listbox.insert(i + 1, name)
+            self.mark_listbox(i, filename)
+
+    def mark_listbox(self, index: int, filename: str) -> None:
+        """ Colour a listbox entry by its issues, red if it is invalid, orange if it only has warnings. """
+        issues = self.issues.get(filename, [])
+        colour = "black" if not issues else ("dark orange" if is_valid(issues) else "red")
+        self.listbox.itemconfig(index, fg=colour)
 
     def click_event_listbox(self, e) -> None:
         """
@@ -129,10 +269,13 @@ class App:
         """
         wh = self.current_warehouses[self.listbox.curselection()[0]]
         path = self.properties.dir_path + "/" + wh
-        new_window = tk.Toplevel(self.root)
-        if (VISUALIZE == self.options_var.get()): Visualize(new_window, path)
-        elif (TABOO == self.options_var.get()): Taboo(new_window, path)
-        elif (SEQUENCE == self.options_var.get()): Sequence(new_window, path)
+        blocking = blocking_issues(self.issues.get(wh, []), needs_player=SEQUENCE == self.options_var.get())
+        if blocking:
+            messagebox.showerror("Unable to open", "\n".join(issue["message"] for issue in blocking), parent=self.root)
+            return
+        if (VISUALIZE == self.options_var.get()): self.manager.open(Visualize, path)
+        elif (TABOO == self.options_var.get()): self.manager.open(Taboo, path)
+        elif (SEQUENCE == self.options_var.get()): self.manager.open(Sequence, path)
 
     def click_event_listbox_right_click(self, e):
         """ 
@@ -145,4 +288,5 @@ class App:
         menu.tk_popup(e.x_root, e.y_root)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # worker processes in the packaged .exe
     app: App = App()
\ No newline at end of file
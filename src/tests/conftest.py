@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Run from anywhere: the tests import the components package from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
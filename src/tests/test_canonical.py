@@ -0,0 +1,29 @@
+from components.canonical import canonical_hash, duplicate_groups
+from components.sokoban import Warehouse
+
+BOARD = "######\n#@$$ #\n#..  #\n######\n"
+MIRRORED = "######\n# $$@#\n#  ..#\n######\n"
+
+def _warehouse(text: str) -> Warehouse:
+    wh = Warehouse(); wh.from_lines(text.splitlines(True))
+    return wh
+
+def test_mirrored_copies_are_duplicates():
+    assert canonical_hash(_warehouse(BOARD)) == canonical_hash(_warehouse(MIRRORED))
+
+def test_weights_follow_boxes_under_symmetry():
+    # Mirroring reverses the box order, so "1 9" mirrored is "9 1"
+    assert canonical_hash(_warehouse("1 9\n" + BOARD)) == canonical_hash(_warehouse("9 1\n" + MIRRORED))
+    assert canonical_hash(_warehouse("1 9\n" + BOARD)) != canonical_hash(_warehouse("9 1\n" + BOARD))
+    assert canonical_hash(_warehouse("1 9\n" + BOARD)) != canonical_hash(_warehouse(BOARD))
+
+def test_differently_weighted_files_are_not_grouped(tmp_path):
+    (tmp_path / "a.txt").write_text("1 9\n" + BOARD)
+    (tmp_path / "b.txt").write_text("9 1\n" + BOARD)
+    (tmp_path / "c.txt").write_text("9 1\n" + MIRRORED)
+    assert duplicate_groups(str(tmp_path)) == [["a.txt", "c.txt"]]
+
+def test_non_utf8_file_is_hashed(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"; caf\xe9\n" + BOARD.encode())
+    (tmp_path / "b.txt").write_text(MIRRORED)
+    assert duplicate_groups(str(tmp_path)) == [["a.txt", "b.txt"]]
@@ -0,0 +1,9 @@
+from components.fixtures import export_fixtures
+
+def test_unparsable_file_is_skipped(tmp_path):
+    (tmp_path / "good.txt").write_text("#####\n#@$.#\n#####\n")
+    (tmp_path / "hello.txt").write_text("hello\n")
+    fixtures, recomputed, skipped = export_fixtures(str(tmp_path))
+    assert [f["warehouse"] for f in fixtures] == ["good.txt"] and recomputed == 2
+    assert [f["warehouse"] for f in skipped] == ["hello.txt"]
+    assert export_fixtures(str(tmp_path))[1:] == (1, skipped) # the good file comes from the cache
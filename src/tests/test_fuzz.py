@@ -0,0 +1,24 @@
+import os
+from components.board import Board
+from components.fuzz import compare, fuzz_warehouse
+
+WAREHOUSE = "  #####\n  #@$.#\n  #   #\n  #####\n"
+
+def _path(tmp_path) -> str:
+    path = tmp_path / "warehouse.txt"
+    path.write_text(WAREHOUSE)
+    return str(path)
+
+def test_headless_board_needs_no_gui(tmp_path):
+    board = Board(None, _path(tmp_path))
+    assert board.tiles == {} and board.apply_moves(["Right", "Right"]) == 1
+    assert str(board) == "#####\n# @*#\n#   #\n#####"
+
+def test_board_agrees_with_engine(tmp_path):
+    board = Board(None, _path(tmp_path))
+    assert compare(board, ["Down", "Right", "Up", "Left", "Right", "Right", "Up"]) == None
+
+def test_fuzz_warehouse_without_display(tmp_path, monkeypatch):
+    monkeypatch.delenv("DISPLAY", raising=False)
+    result = fuzz_warehouse((_path(tmp_path), 1, 200, 20, [["Right"]]))
+    assert result == {"warehouse": os.path.basename(_path(tmp_path)), "sequences": 200, "divergences": []}
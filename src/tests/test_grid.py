@@ -0,0 +1,12 @@
+from components.grid import Grid
+
+def test_fill_rect_clamps_to_grid():
+    grid = Grid(4, 3)
+    changed = grid.fill_rect(-2, 1, 1, 9, "#")
+    assert changed == {(0, 1), (1, 1), (0, 2), (1, 2)}
+
+def test_fill_rect_fully_out_of_bounds():
+    grid = Grid(4, 3)
+    for rect in [(-5, 0, -2, 2), (5, 0, 9, 2), (0, -4, 3, -1), (0, 3, 3, 7)]:
+        assert grid.fill_rect(*rect, "#") == set()
+    assert grid.data == Grid(4, 3).data
@@ -0,0 +1,10 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_headless_modules_do_not_import_tk():
+    code = ("import sys, components, components.service, components.cache, components.validate\n"
+            "assert 'tkinter' not in sys.modules and 'PIL' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], cwd=SRC, check=True)
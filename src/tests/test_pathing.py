@@ -0,0 +1,27 @@
+from components.board import Board
+from components.pathing import PathPlanner
+
+# The box at (2, 2) can be pushed Up, then undone and pushed Right instead:
+# both leave the player at (2, 2) after one push, with the box somewhere else
+WAREHOUSE = "######\n#    #\n# $  #\n# @  #\n######\n"
+
+def test_version_only_increases(tmp_path):
+    path = tmp_path / "warehouse.txt"; path.write_text(WAREHOUSE)
+    board = Board(None, str(path))
+    versions = [board.version]
+    board.apply_moves(["Up"]); versions.append(board.version)
+    board.undo_move(); versions.append(board.version)
+    board.reset(); versions.append(board.version)
+    assert versions == sorted(set(versions))
+
+def test_walk_after_undo_does_not_reuse_stale_tree(tmp_path):
+    path = tmp_path / "warehouse.txt"; path.write_text(WAREHOUSE)
+    board, planner = Board(None, str(path)), PathPlanner()
+    assert board.apply_moves(["Up"]) == 1 # box to (2, 1), player at (2, 2)
+    planner.walk_to(board.board, board.player, (1, 1), board.version)
+    board.undo_move()
+    assert board.apply_moves(["Left", "Up", "Right"]) == 3 # box to (3, 2), player at (2, 2)
+    assert board.player == (2, 2) and board.pushes == 1
+    plan = planner.walk_to(board.board, board.player, (4, 2), board.version)
+    assert len(plan) == 4 # around the box, not through it
+    assert board.apply_moves(plan) == 4 and board.pushes == 1 and board.player == (4, 2)
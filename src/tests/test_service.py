@@ -0,0 +1,41 @@
+import asyncio
+import json
+from components.service import VerificationService
+
+WAREHOUSE = "#####\n#@$.#\n#####"
+
+async def _request(port: int, body: bytes) -> bytes:
+    """ One Connection: close request, read through to EOF (which hangs if a worker holds the socket). """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"POST /verify HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                 b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), timeout=10)
+    writer.close()
+    return response
+
+def test_closed_connection_reaches_eof():
+    async def run() -> list:
+        service = VerificationService(port=0, workers=2)
+        await service.start()
+        try:
+            body = json.dumps({"warehouse": WAREHOUSE, "actions": ["Right"]}).encode()
+            return [await _request(service.port, body) for _ in range(2)]
+        finally: service.close()
+    for response in asyncio.run(run()):
+        head, _, body = response.partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 200")
+        assert json.loads(body) == {"result": "#####\n# @*#\n#####",
+                                    "impossible": False, "cost": 1}
+
+def test_bad_action_only_fails_its_own_request():
+    async def run() -> bytes:
+        service = VerificationService(port=0, workers=1)
+        await service.start()
+        try:
+            body = json.dumps([{"warehouse": WAREHOUSE, "actions": ["Right"]},
+                               {"warehouse": WAREHOUSE, "actions": [["Up"]]}]).encode()
+            return await _request(service.port, body)
+        finally: service.close()
+    good, bad = json.loads(asyncio.run(run()).partition(b"\r\n\r\n")[2])["results"]
+    assert good["cost"] == 1 and "error" in bad
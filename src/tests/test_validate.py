@@ -0,0 +1,30 @@
+from components.sokoban import Warehouse
+from components.validate import blocking_issues, is_valid, validate_text
+
+ALTERNATIVE = "######\n#!$  #\n######\n" # '!' is the alternative player on target
+
+def test_parser_reads_alternative_player_on_target():
+    wh = Warehouse(); wh.from_lines(ALTERNATIVE.splitlines(keepends=True))
+    assert wh.worker == (1, 1)
+    assert wh.targets == [(1, 1)] and len(wh.boxes) == len(wh.targets)
+
+def test_validator_accepts_alternative_player_on_target():
+    assert validate_text(ALTERNATIVE) == []
+
+def test_validator_reports_errors():
+    codes = {issue["code"] for issue in validate_text("#####\n# $?#\n#####\n")}
+    assert codes == {"illegal-char", "no-player", "box-target-count"}
+    assert not is_valid(validate_text("#####\n# $?#\n#####\n"))
+
+def test_only_unloadable_warehouses_are_blocked():
+    open_border = validate_text("#####\n#@$. \n#####\n")
+    assert not is_valid(open_border) and blocking_issues(open_border, needs_player=True) == []
+    no_player = validate_text("#####\n# $.#\n#####\n")
+    assert blocking_issues(no_player) == [] and len(blocking_issues(no_player, needs_player=True)) == 1
+
+def test_validate_dir_in_thread(tmp_path, monkeypatch):
+    import components.validate as validate
+    monkeypatch.setattr(validate, "BATCH_SIZE", 1)
+    monkeypatch.setattr(validate, "ProcessPoolExecutor", None) # a pool would fail
+    for i in range(3): (tmp_path / f"{i}.txt").write_text(f"#####\n#@$.#\n#####\n{'#' * i}\n")
+    assert validate.validate_dir(str(tmp_path), workers=1) == {f"{i}.txt": [] for i in range(3)}
@@ -1,7 +1,10 @@
 from .buildboard import BuildBoard
+from .compare import Compare
+from .diffboard import DiffBoard
+from .manager import WindowManager
 from .pasteboard import PasteBoard
 from .sequence import Sequence
 from .taboo import Taboo
 from .visualize import Visualize
 
-__all__ = ['buildboard', 'pasteboard', 'sequence', 'taboo', 'visualize'] 
\ No newline at end of file
+__all__ = ['buildboard', 'compare', 'diffboard', 'manager', 'pasteboard', 'reload', 'sequence', 'taboo', 'visualize'] 
\ No newline at end of file
@@ -9,5 +9,4 @@ class BuildBoard:
         self.root.focus_force()
         self.root.title("SKBN - Builder Tool")
         tk.Label(self.root, text="Build Sokoban Warehouse Tool", font=H1).pack(side=tk.TOP, pady=10)
-        self.builder = Builder(self.root)
-        self.root.mainloop()
\ No newline at end of file
+        self.builder = Builder(self.root)
\ No newline at end of file
@@ -0,0 +1,138 @@
+import tkinter as tk
+import os
+import time
+from typing import List
+from components.board import Board
+from components.fixtures import load_sequences
+from components.globals import H1, BUTTONS, TABOO, DIRECTIONS
+
+FRAME_MS = 30 # one scheduler tick, every board is advanced and repainted together
+COMPARE_TILE_SIZE = 20
+COLUMNS = 4
+
+class Player:
+    """ One (warehouse, sequence) pair being played back on a board in the comparison grid. """
+    def __init__(self, holder: tk.Frame, path: str, name: str, moves: List[str]) -> None:
+        self.name = name
+        self.moves = moves
+        self.index = 0
+        self.impossible = False
+        self.status = tk.StringVar()
+        tk.Label(holder, text=f"{os.path.basename(path).split('.txt')[0]}: {name}").pack(side=tk.TOP)
+        tk.Label(holder, textvariable=self.status).pack(side=tk.TOP)
+        self.board = Board(holder, path, config={BUTTONS: False, TABOO: False}, tile_size=COMPARE_TILE_SIZE)
+        self.update_status()
+
+    @property
+    def finished(self) -> bool:
+        return self.impossible or self.index >= len(self.moves)
+
+    def advance(self, steps: int) -> None:
+        """ Apply the next moves in one batch, so each changed tile is repainted once. """
+        batch = self.moves[self.index:self.index + steps]
+        applied = self.board.apply_moves(batch)
+        self.index += applied
+        if applied < len(batch): self.impossible = True
+        self.update_status()
+
+    def update_status(self) -> None:
+        state = "Impossible!" if self.impossible else ("Done" if self.finished else "")
+        self.status.set(f"{self.index}/{len(self.moves)} moves, cost {self.board.cost} {state}")
+
+class Compare:
+    """
+        Lets users replay many registered (warehouse, sequence) pairs side by side.
+        A single scheduler on the window's event loop advances every board by the
+        same number of moves each frame, so the boards stay in step with each other.
+    """
+    def __init__(self, root: tk.Tk, dir_path: str) -> None:
+        self.root = root
+        self.dir_path = dir_path
+        self.root.focus_force()
+        self.root.title("SKBN - Compare Tool")
+        tk.Label(self.root, text="Compare Sequences", font=H1).pack(side=tk.TOP, pady=(10,0), padx=50)
+        self.players: List[Player] = []
+        self.job = None
+        self.last_frame = 0.0
+        self.budget = 0.0
+        self.speed = tk.DoubleVar(); self.speed.set(10)
+        self.set_content()
+
+    def set_content(self) -> None:
+        """ Setup the list of registered sequences, the playback controls, and the board grid. """
+        self.content = tk.Frame(self.root)
+        self.status = tk.StringVar(); self.status.set("Select sequences (registered in the Sequence tool) to compare.")
+        tk.Label(self.content, textvariable=self.status).pack(side=tk.TOP, fill=tk.X)
+        self.listbox = tk.Listbox(self.content, selectmode=tk.EXTENDED, height=6)
+        self.pairs = [(wh, name, moves) for wh, sequences in sorted(load_sequences(self.dir_path).items())
+                      for name, moves in sequences.items()]
+        for wh, name, moves in self.pairs: 
+            self.listbox.insert(tk.END, f"{wh.split('.txt')[0]}: {name} ({len(moves)} moves)")
+        self.listbox.pack(side=tk.TOP, fill=tk.X)
+
+        controls = tk.Frame(self.content)
+        tk.Button(controls, text="Compare selected", command=self.set_boards).pack(side=tk.LEFT)
+        self.playButton = tk.Button(controls, text="Play ⏯️", width=7, state=tk.DISABLED, command=self.play_pause)
+        self.playButton.pack(side=tk.LEFT)
+        self.stepButton = tk.Button(controls, text=">", state=tk.DISABLED, command=lambda: self.advance(1))
+        self.stepButton.pack(side=tk.LEFT)
+        tk.Label(controls, text="Moves/s:").pack(side=tk.LEFT)
+        tk.Scale(controls, variable=self.speed, from_=1, to=200, orient=tk.HORIZONTAL).pack(side=tk.LEFT)
+        controls.pack(side=tk.TOP, fill=tk.X)
+        self.content.pack(side=tk.TOP, fill=tk.X)
+        self.boards = tk.Frame(self.root); self.boards.pack(side=tk.TOP)
+
+    def set_boards(self) -> None:
+        """ Create a board for every selected pair, laid out in a grid, all at move 0. """
+        self.pause()
+        selected = [self.pairs[i] for i in self.listbox.curselection()]
+        invalid = [name for _, name, moves in selected if any(d not in DIRECTIONS for d in moves)]
+        if not selected or invalid:
+            self.status.set(f"Invalid moves in {invalid[0]}." if invalid else "Nothing selected.")
+            return
+        self.boards.destroy(); self.boards = tk.Frame(self.root); self.boards.pack(side=tk.TOP)
+        self.players = []
+        for i, (wh, name, moves) in enumerate(selected):
+            holder = tk.Frame(self.boards, padx=5, pady=5)
+            holder.grid(row=i // COLUMNS, column=i % COLUMNS, sticky=tk.N)
+            try: self.players.append(Player(holder, os.path.join(self.dir_path, wh), name, moves))
+            except (OSError, ValueError): tk.Label(holder, text=f"Unable to load {wh}.", fg="red").pack()
+        self.status.set(f"Comparing {len(self.players)} sequence(s).")
+        for tkobj in [self.playButton, self.stepButton]: tkobj.config(state=tk.NORMAL)
+
+    def play_pause(self) -> None:
+        if self.job == None:
+            self.playButton.config(text="Pause ⏯️")
+            self.last_frame, self.budget = time.perf_counter(), 0.0
+            self.job = self.root.after(FRAME_MS, self.frame)
+        else: self.pause()
+
+    def pause(self) -> None:
+        self.cancel()
+        self.playButton.config(text="Play ⏯️")
+
+    def cancel(self) -> None:
+        if self.job != None: self.root.after_cancel(self.job)
+        self.job = None
+
+    def close(self) -> None:
+        """ Stop the scheduler and drop the boards, called by the window manager on close. """
+        self.cancel()
+        self.players = []
+
+    def frame(self) -> None:
+        """
+            One scheduler tick. The moves owed since the last tick (from the speed)
+            are applied to every board at once, then the next tick is scheduled.
+        """
+        now = time.perf_counter()
+        self.budget += (now - self.last_frame) * self.speed.get()
+        self.last_frame = now
+        steps = int(self.budget); self.budget -= steps
+        if steps: self.advance(steps)
+        if all(player.finished for player in self.players): self.pause()
+        else: self.job = self.root.after(FRAME_MS, self.frame)
+
+    def advance(self, steps: int) -> None:
+        for player in self.players:
+            if not player.finished: player.advance(steps)
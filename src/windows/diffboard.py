@@ -0,0 +1,52 @@
+import tkinter as tk
+from components.board import Board
+from components.diff import diff_boards
+from components.globals import H1
+from components.parsing import board_lines, find_invalid
+
+class DiffBoard:
+    """
+        Lets users compare an expected board with an actual board (i.e., from a failing test).
+        The actual board is shown with every mismatched cell highlighted, 
+        alongside a summary of moved boxes and the player position.
+    """
+    def __init__(self, root: tk.Tk) -> None:
+        self.root = root
+        self.root.focus_force()
+        self.root.title("SKBN - Diff Tool")
+        tk.Label(self.root, text="Diff Expected vs Actual", font=H1).pack(side=tk.TOP, pady=(10,0), padx=50)
+        self.set_content()
+
+    def set_content(self) -> None:
+        """ Setup the two paste fields, and the result section. """
+        self.content = tk.Frame(self.root)
+        self.status = tk.StringVar(); self.status.set("")
+        self.expected_var = tk.StringVar(); self.actual_var = tk.StringVar()
+        tk.Label(self.content, text="", textvariable=self.status, fg="red").pack(side=tk.TOP, fill=tk.X)
+        tk.Label(self.content, text="Expected:").pack(side=tk.TOP, anchor=tk.W)
+        tk.Entry(self.content, textvariable=self.expected_var).pack(side=tk.TOP, fill=tk.X)
+        tk.Label(self.content, text="Actual:").pack(side=tk.TOP, anchor=tk.W)
+        tk.Entry(self.content, textvariable=self.actual_var).pack(side=tk.TOP, fill=tk.X)
+        tk.Button(self.content, text="Click to compare.", command=self.set_diff).pack(side=tk.TOP, fill=tk.X)
+        self.content.pack(side=tk.TOP, fill=tk.X)
+        self.diffview = tk.Frame(self.root); self.diffview.pack(side=tk.TOP)
+
+    def set_diff(self) -> None:
+        """ Validate both boards, then show the actual board with the differences highlighted. """
+        expected, actual = self.expected_var.get(), self.actual_var.get()
+        errors = find_invalid(["\n".join(board_lines(expected)), "\n".join(board_lines(actual))])
+        if errors:
+            which = "Expected" if 0 in errors else "Actual"
+            self.status.set(f"{which}: {errors[min(errors)]}")
+            return
+
+        self.status.set("")
+        diff = diff_boards(expected, actual)
+        self.diffview.destroy(); self.diffview = tk.Frame(self.root); self.diffview.pack(side=tk.TOP)
+        text_field = tk.Text(self.diffview)
+        board = Board(self.diffview, None, side=tk.LEFT, text_field=text_field,
+                      build_warehouse_from_array=board_lines(actual))
+        board.highlight(diff.cells)
+        text_field.config(width=50, height=10)
+        text_field.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        board.update_text_field("\n".join(diff.summary()))
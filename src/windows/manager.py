@@ -0,0 +1,37 @@
+import tkinter as tk
+from typing import Dict, List
+
+class WindowManager:
+    """
+        Opens every tool window as a Toplevel of the one root window, whose mainloop
+        is the only event loop of the app. Windows are registered while open, and are
+        closed through the manager, which calls the window's close() (if it has one) so
+        it can stop its scheduled callbacks and save its state before being destroyed.
+    """
+    def __init__(self, root: tk.Tk) -> None:
+        self.root = root
+        self.windows: Dict[tk.Toplevel, object] = {}
+
+    def open(self, window_class, *args) -> object:
+        """ Create a window, i.e., open(Visualize, path), inside a new registered Toplevel. """
+        toplevel = tk.Toplevel(self.root)
+        toplevel.protocol("WM_DELETE_WINDOW", lambda: self.close(toplevel))
+        try: window = window_class(toplevel, *args)
+        except Exception:
+            toplevel.destroy()
+            raise
+        self.windows[toplevel] = window
+        return window
+
+    def close(self, toplevel: tk.Toplevel) -> None:
+        """ Release a window's resources, unregister it and destroy it. """
+        window = self.windows.pop(toplevel, None)
+        if hasattr(window, "close"): window.close()
+        toplevel.destroy()
+
+    def close_all(self) -> None:
+        for toplevel in list(self.windows): self.close(toplevel)
+
+    def windows_for(self, path: str) -> List[tk.Toplevel]:
+        """ The open windows showing a warehouse file. """
+        return [toplevel for toplevel, window in self.windows.items() if getattr(window, "path", None) == path]
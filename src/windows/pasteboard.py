@@ -1,16 +1,33 @@
 import tkinter as tk
-from components.board import Board 
-from components.globals import H1, LEGAL_CHARS, WALL
+from typing import Dict, List, Tuple
+from components.board import Board
+from components.globals import H1
+from components.parsing import board_lines, parse_board_block, find_invalid
+
+GALLERY_TILE_SIZE = 16
 
 class PasteBoard:
-    """ Lets users graphically view a Sokoban warehouse from pasting as string. """
+    """
+        Lets users graphically view a Sokoban warehouse from pasting as string.
+        In bulk mode, a whole block of boards can be pasted at once and
+        viewed in a scrollable gallery.
+    """
     def __init__(self, root: tk.Tk) -> None:
         self.root = root
         self.root.focus_force()
         self.root.title("SKBN - Visualizer Tool")
         tk.Label(self.root, text="Build From Paste", font=H1).pack(side=tk.TOP, pady=(10,0), padx=50)
+        self.mode = tk.IntVar(); self.mode.set(0)
+        modes = tk.Frame(self.root); modes.pack(side=tk.TOP)
+        tk.Radiobutton(modes, text="Single", variable=self.mode, value=0, command=self.change_mode).pack(side=tk.LEFT)
+        tk.Radiobutton(modes, text="Bulk", variable=self.mode, value=1, command=self.change_mode).pack(side=tk.LEFT)
         self.set_content()
-        self.root.mainloop()
+
+    def change_mode(self) -> None:
+        """ Swap between pasting a single board, and pasting many boards into a gallery. """
+        self.content.destroy(); self.boardview.destroy()
+        if self.mode.get() == 0: self.set_content()
+        else: self.set_bulk_content()
 
     def set_content(self) -> None:
         """ Setup the content section of the pasteboard. """
@@ -21,33 +38,100 @@ class PasteBoard:
         tk.Entry(self.content, textvariable=self.paste_var).pack(side=tk.TOP, fill=tk.X)
         tk.Button(self.content, text="Click to load board.", command=self.set_board).pack(side=tk.TOP, fill=tk.X)
         self.boardview = tk.Frame(self.root); self.boardview.pack(side=tk.TOP)
-        self.content.pack(side=tk.TOP, fill=tk.X) 
+        self.content.pack(side=tk.TOP, fill=tk.X)
 
     def set_board(self) -> None:
         """ On click to load board, reads the textbar and attempts to visualize a warehouse. """
-        # Make sure that the warehouse is > 1 tile or char
-        if len(self.paste_var.get()) <= 1: 
-            self.status.set(f"Invalid board.")
-            self.content.update()
-            return
-        
-        # Make sure that there is a wall character to determine
-        # where the weights end and when the board starts
-        if (not(WALL in self.paste_var.get())):
-            self.status.set(f"No wall character found!")
+        # Make sure the warehouse is > 1 tile, has a wall character to determine
+        # where the weights end and when the board starts, and only has parsable chars
+        as_array = board_lines(self.paste_var.get())
+        errors = find_invalid(["\n".join(as_array)])
+        if errors:
+            self.status.set(errors[0])
             self.content.update()
             return
 
-        # Iterate over ever char, and make sure there are only parsable chars
-        as_array = self.paste_var.get().replace('\'', '').replace('"', '').split('\\n')
-        for char in "".join(as_array):
-            if char not in LEGAL_CHARS:
-                self.status.set(f"Illegal char '{char}' given.")
-                self.content.update()
-                return
-            
         # Clear the existing board, and add the visualization
         self.status.set(f""); self.content.update()
         self.boardview.destroy(); self.boardview = tk.Frame(self.root); self.boardview.pack(side=tk.TOP)
-        board = Board(self.boardview, None, build_warehouse_from_array=as_array)
-        self.root.mainloop()
\ No newline at end of file
+        Board(self.boardview, None, build_warehouse_from_array=as_array)
+
+    def set_bulk_content(self) -> None:
+        """ Setup the bulk paste section, and an empty gallery. """
+        self.content = tk.Frame(self.root)
+        self.status = tk.StringVar(); self.status.set("")
+        tk.Label(self.content, text="", textvariable=self.status, fg="red").pack(side=tk.TOP, fill=tk.X)
+        tk.Label(self.content, text="Paste repr strings (one per line), or a Python list of them.").pack(side=tk.TOP)
+        self.paste_text = tk.Text(self.content, height=6)
+        self.paste_text.pack(side=tk.TOP, fill=tk.X)
+        tk.Button(self.content, text="Click to load boards.", command=self.set_gallery).pack(side=tk.TOP, fill=tk.X)
+        self.content.pack(side=tk.TOP, fill=tk.X)
+
+        # The gallery is a canvas of fixed size slots, boards are only built when visible
+        self.boardview = tk.Frame(self.root); self.boardview.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(self.boardview, width=600, height=400)
+        scrollbar = tk.Scrollbar(self.boardview, orient=tk.VERTICAL, command=self.scroll_gallery)
+        self.canvas.config(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", lambda e: self.render_gallery(relayout=True))
+        self.canvas.bind("<MouseWheel>", lambda e: self.scroll_gallery("scroll", -e.delta // 120, "units"))
+        self.canvas.bind("<Button-4>", lambda e: self.scroll_gallery("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll_gallery("scroll", 1, "units"))
+        self.boards: List[List[str]] = []
+        self.rendered: Dict[int, Tuple[tk.Frame, int]] = {}
+
+    def set_gallery(self) -> None:
+        """
+            Parse and validate every pasted board at once, then lay them out
+            in the gallery. Invalid boards are reported and left out.
+        """
+        boards = parse_board_block(self.paste_text.get("1.0", tk.END))
+        errors = find_invalid(boards)
+        self.status.set(
+            f"{len(errors)} invalid board(s), first is #{min(errors) + 1}: {errors[min(errors)]}"
+            if errors else f"Loaded {len(boards)} board(s).")
+        self.boards = [board_lines(b) for i, b in enumerate(boards) if i not in errors]
+        self.indices = [i for i in range(len(boards)) if i not in errors]
+
+        # Every slot fits the largest board, so the layout is known without building any board
+        self.slot_w = max([max(len(r) for r in b) for b in self.boards], default=1) * GALLERY_TILE_SIZE + 20
+        self.slot_h = max([len(b) for b in self.boards], default=1) * GALLERY_TILE_SIZE + 40
+        self.render_gallery(relayout=True)
+
+    def scroll_gallery(self, *args) -> None:
+        """ Scroll the gallery, then build the newly visible boards. """
+        self.canvas.yview(*args)
+        self.render_gallery()
+
+    def render_gallery(self, relayout=False) -> None:
+        """
+            Builds the boards in the visible rows of the gallery, and destroys
+            those that have scrolled out of view.
+        """
+        if not self.boards: return
+        if relayout:
+            for i in list(self.rendered): self.remove_slot(i)
+            self.columns = max(1, self.canvas.winfo_width() // self.slot_w)
+            rows = -(-len(self.boards) // self.columns)
+            self.canvas.config(scrollregion=(0, 0, self.columns * self.slot_w, rows * self.slot_h))
+
+        top = self.canvas.canvasy(0)
+        first_row = int(top // self.slot_h)
+        last_row = int((top + self.canvas.winfo_height()) // self.slot_h)
+        visible = set(range(first_row * self.columns, min(len(self.boards), (last_row + 1) * self.columns)))
+
+        for i in [i for i in self.rendered if i not in visible]: self.remove_slot(i)
+        for i in sorted(visible - self.rendered.keys()):
+            frame = tk.Frame(self.canvas)
+            tk.Label(frame, text=f"#{self.indices[i] + 1}").pack(side=tk.TOP)
+            Board(frame, None, build_warehouse_from_array=self.boards[i], tile_size=GALLERY_TILE_SIZE)
+            row, col = divmod(i, self.columns)
+            item = self.canvas.create_window(col * self.slot_w, row * self.slot_h, window=frame, anchor=tk.NW)
+            self.rendered[i] = (frame, item)
+
+    def remove_slot(self, i: int) -> None:
+        """ Destroy a rendered gallery board, along with its canvas item. """
+        frame, item = self.rendered.pop(i)
+        self.canvas.delete(item)
+        frame.destroy()
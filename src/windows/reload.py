@@ -0,0 +1,34 @@
+import tkinter as tk
+from typing import Callable
+from components.globals import WAREHOUSE_CHANGED
+
+class Reloadable:
+    """
+        Mixin for windows showing a warehouse file (self.path, with its board in self.holder),
+        which offers to reload the board when the file changes on disk.
+        Windows provide new_board(holder) and pack_holder(holder), and may extend on_reload().
+    """
+    def set_reload_bar(self, anchor: Callable[[], tk.Widget]) -> None:
+        """ Prepares a bar, shown (above the widget anchor returns) when the warehouse file changes on disk. """
+        self.reload_status = tk.StringVar(); self.reload_status.set("This warehouse changed on disk.")
+        self.reload_bar = tk.Frame(self.root)
+        tk.Label(self.reload_bar, textvariable=self.reload_status, fg="red").pack(side=tk.LEFT)
+        tk.Button(self.reload_bar, text="Reload", command=self.reload).pack(side=tk.RIGHT)
+        self.root.bind(WAREHOUSE_CHANGED, lambda e: self.reload_bar.pack(side=tk.TOP, fill=tk.X, before=anchor()))
+
+    def reload(self) -> None:
+        """ Rebuild the board from the changed file (parsed through the parse cache). """
+        try:
+            holder = tk.Frame(self.root)
+            board = self.new_board(holder)
+        except (OSError, ValueError):
+            holder.destroy()
+            self.reload_status.set("Unable to load the changed warehouse.")
+            return
+        self.holder.destroy(); self.holder = holder; self.pack_holder(holder)
+        self.board = board
+        self.on_reload()
+        self.reload_bar.pack_forget()
+
+    def on_reload(self) -> None:
+        """ Called once the new board is in place, i.e., to reset any state of the old board. """
@@ -1,11 +1,15 @@
 import tkinter as tk
-from tkinter import simpledialog
-import time
-import threading
+from tkinter import simpledialog, filedialog
+import os
 from components.board import Board 
-from components.globals import H1, BUTTONS, TABOO, DIRECTIONS
+from components.fixtures import register_sequence
+from components.pathing import PathPlanner
+from components.recording import SessionRecorder, Session, SESSION_EXT, UNDO
+from components.globals import H1, BUTTONS, TABOO, DEADLOCKS, DIRECTIONS, BOX, BOX_ON_TARGET
+from components.globals import STATUS_MS
+from windows.reload import Reloadable
 
-class Sequence:
+class Sequence(Reloadable):
     """ 
         Lets users graphically view a Sokoban warehouse,
         and either play the game, or watch a sequence of moves
@@ -20,11 +24,39 @@ class Sequence:
         tk.Label(self.root, text=f"Sequencer for {wh_name}", font=H1).pack(side=tk.TOP, pady=(10, 0))
         self.moves = []
         self.moves_index = 0
+        self.applied = [] # indices of self.moves which moved the player, for undo
+        self.playback = iter(())
+        self.recorder = SessionRecorder(path)
+        self.planner = PathPlanner()
+        self.play_job = None
+        self.selected_box = None
         self.player_status = tk.StringVar(); self.player_status.set("Play")
         self.sleep = tk.DoubleVar(); self.sleep.set(50)
+        self.stop_at_deadlock = tk.BooleanVar(); self.stop_at_deadlock.set(False)
+        self.set_reload_bar(anchor=lambda: self.playView)
         self.set_content()
         self.set_keybinds(True)
-        self.root.mainloop()
+
+    def new_board(self, holder: tk.Frame) -> Board:
+        """ Creates the playable board inside a holder frame. """
+        board = Board(holder, self.path, config={BUTTONS: False, TABOO: False, DEADLOCKS: True},
+                      side=tk.LEFT, text_field=self.text_field)
+        board.bind_tiles(self.tile_clicked)
+        return board
+
+    def pack_holder(self, holder: tk.Frame) -> None:
+        holder.pack(side=tk.LEFT, before=self.text_field)
+
+    def on_reload(self) -> None:
+        """ A reloaded board also resets the player, the moves and any sequence being played. """
+        self.stop_playing()
+        for tkobj in [self.toEndButton, self.nextButton, self.playButton]:
+            tkobj.config(state=tk.DISABLED)
+        self.planner = PathPlanner() # its cached tree belongs to the old board
+        self.save_session(quiet=True); self.recorder = SessionRecorder(self.path)
+        self.moves, self.moves_index, self.selected_box = [], 0, None
+        self.applied, self.playback = [], iter(())
+        self.impossible_status.set(""); self.deadlock_status.set(""); self.cost_status.set("Cost: 0")
 
     def set_sleep_speed(self) -> None:
         """ Ask user to enter speed value for animation. """
@@ -40,6 +72,10 @@ class Sequence:
         self.impossible_status = tk.StringVar(); self.impossible_status.set("")
         self.impossible_alert = tk.Label(self.root, fg="red", 
                                          textvariable=self.impossible_status).pack(side=tk.TOP)
+        self.deadlock_status = tk.StringVar(); self.deadlock_status.set("")
+        tk.Label(self.root, fg="dark orange", textvariable=self.deadlock_status).pack(side=tk.TOP)
+        self.cost_status = tk.StringVar(); self.cost_status.set("Cost: 0")
+        tk.Label(self.root, textvariable=self.cost_status).pack(side=tk.TOP)
         
         # Add options to either manually move the player, or by sequence
         self.mode = tk.IntVar(); self.mode.set(0)
@@ -63,6 +99,12 @@ class Sequence:
         self.beginButton = tk.Button(
             self.playView, text="Click to load", state=tk.DISABLED, 
             command=self.load_directions); self.beginButton.pack(side=tk.RIGHT)
+        self.sessionButton = tk.Button(
+            self.playView, text="Load session", state=tk.DISABLED, 
+            command=self.load_session); self.sessionButton.pack(side=tk.RIGHT)
+        tk.Checkbutton(
+            self.playView, text="Stop at deadlock", 
+            variable=self.stop_at_deadlock).pack(side=tk.RIGHT)
         self.playView.pack(side=tk.TOP, expand=True, fill=tk.X)
         
         # Add the board and copy result functionalities
@@ -70,14 +112,20 @@ class Sequence:
         self.text_field.insert(tk.END, 
                 "Manual mode is enabled.\n\n" + \
                 "This means that you can use your arrow keys, " + \
-                "or your WASD keys to move the player around.")
-        self.board = Board(self.root, self.path, side=tk.LEFT, text_field=self.text_field)
+                "or your WASD keys to move the player around.\n\n" + \
+                "Click a tile to walk there, or click a box " + \
+                "and then a tile to push the box there.\n\n" + \
+                "Z or Backspace undoes the last move.")
+        self.holder = tk.Frame(self.root); self.holder.pack(side=tk.LEFT)
+        self.board = self.new_board(self.holder)
         self.text_field.config(width=self.board.wh.ncols + 5, height=10, state=tk.DISABLED)
         self.text_field.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
         self.status = tk.StringVar(); self.status.set("")
         tk.Label(self.root, text="", textvariable=self.status, bg="white").pack(fill=tk.X)
         tk.Button(self.root, text="Copy Moves", 
                   command=lambda:self.to_clipboard(text=repr(self.moves))).pack(fill=tk.X)
+        tk.Button(self.root, text="Register Moves", command=self.register_moves).pack(fill=tk.X)
+        tk.Button(self.root, text="Save Session", command=self.save_session).pack(fill=tk.X)
         tk.Button(self.root, text="Copy Result", 
                   command=lambda:self.to_clipboard(
                       text=self.impossible_status.get() 
@@ -88,6 +136,7 @@ class Sequence:
         # Sequence mode is #1 or True
         sequence_mode = bool(self.mode.get())
         self.beginButton.config(state=tk.NORMAL if sequence_mode else tk.DISABLED)
+        self.sessionButton.config(state=tk.NORMAL if sequence_mode else tk.DISABLED)
         for tkobj in [self.toEndButton, self.nextButton, self.playButton]:
             tkobj.config(state=tk.DISABLED)
 
@@ -100,10 +149,11 @@ class Sequence:
         # Enable or disable keybinds
         self.set_keybinds(not sequence_mode)
 
-        # Clear prior variables
-        self.moves = []
+        # Clear prior variables, and stop any playback
+        self.stop_playing()
+        self.moves, self.applied, self.playback = [], [], iter(())
         self.impossible_status.set("")
-        self.player_status.set("Play")
+        self.deadlock_status.set("")
 
         # Clear textbox and put tutorial text
         text = ("Paste in your moves here, and click \"Click to load\".\n\n" + \
@@ -114,7 +164,10 @@ class Sequence:
                 if sequence_mode else
                 "Manual mode is enabled.\n\n" + \
                 "This means that you can use your arrow keys, " + \
-                "or your WASD keys to move the player around.")
+                "or your WASD keys to move the player around.\n\n" + \
+                "Click a tile to walk there, or click a box " + \
+                "and then a tile to push the box there.\n\n" + \
+                "Z or Backspace undoes the last move.")
         self.text_field.config(state=tk.NORMAL)
         self.text_field.delete('1.0', tk.END)
         self.text_field.insert(tk.END, text)
@@ -129,21 +182,73 @@ class Sequence:
         for key in bindings: 
             if on: self.root.bind(key, lambda e, d=bindings[key]: self.key_event(d))
             else: self.root.unbind(key)
+        for key in ["z", "<BackSpace>"]:
+            if on: self.root.bind(key, lambda e: self.undo_event())
+            else: self.root.unbind(key)
 
     def key_event(self, d) -> None:
         """ Handle request to move the player by a direction. """
-        map = {
-            "Up": (0, -1),
-            "Down": (0, 1),
-            "Left": (-1, 0),
-            "Right": (1, 0),
-        }
-        result = self.board.try_tile_shift(map[d])
+        self.board.last_deadlocks = set()
+        result = self.board.try_tile_shift(DIRECTIONS[d])
         if not result: self.impossible_status.set("Impossible!")
+        self.show_deadlocks()
+        self.cost_status.set(f"Cost: {self.board.cost}")
         if self.mode.get() == 0: 
+            if result: self.applied.append(len(self.moves))
             self.moves.append(d)
+            self.recorder.record(d)
             self.board.update_text_field(repr(self.moves))
 
+    def undo_event(self) -> None:
+        """ 
+            Take back the last move which moved the player. In manual mode the undo is
+            recorded, and the undone move (with any impossible moves after it) is dropped.
+        """
+        if not self.board.undo_move(): return
+        self.deadlock_status.set("")
+        self.cost_status.set(f"Cost: {self.board.cost}")
+        if self.mode.get() == 0:
+            self.recorder.record(UNDO)
+            if self.applied: del self.moves[self.applied.pop():]
+            self.board.update_text_field(repr(self.moves))
+
+    def show_deadlocks(self) -> None:
+        """ Tell the user about any box which was deadlocked by the last move(s). """
+        if self.board.last_deadlocks:
+            cells = ", ".join(str(cell) for cell in sorted(self.board.last_deadlocks))
+            self.deadlock_status.set(f"Deadlock! Box stuck at {cells}")
+
+    def tile_clicked(self, key) -> None:
+        """
+            Handle macro moves in manual mode. Clicking a box selects it,
+            clicking a tile afterwards pushes the selected box there,
+            otherwise the player walks to the clicked tile.
+            The planned moves are applied and repainted in one batch.
+        """
+        if self.mode.get() != 0 or self.board.player == None: return
+        x, y = key
+        version = self.board.version
+        if self.selected_box == None and self.board.board[y][x] in (BOX, BOX_ON_TARGET):
+            self.selected_box = key
+            self.status.set(f"Box {key} selected, click where to push it.")
+            return
+        if self.selected_box != None:
+            plan = self.planner.push_to(self.board.board, self.board.player, self.selected_box, key, version)
+            self.selected_box = None
+        else: plan = self.planner.walk_to(self.board.board, self.board.player, key, version)
+
+        if plan == None: 
+            self.status.set("No path!")
+            return
+        self.status.set("")
+        for d in plan[:self.board.apply_moves(plan)]:
+            self.applied.append(len(self.moves))
+            self.moves.append(d)
+            self.recorder.record(d)
+        self.show_deadlocks()
+        self.cost_status.set(f"Cost: {self.board.cost}")
+        self.board.update_text_field(repr(self.moves))
+
     def load_directions(self) -> None:
         """ 
             Takes the string value from the textbox and attempts
@@ -161,27 +266,56 @@ class Sequence:
         # Check for any invalid directions
         self.moves = text.split(",")
         self.moves_index = 0
+        self.playback = iter(self.moves)
         for direction in self.moves: 
             if direction not in DIRECTIONS.keys():
                 prior_status = self.impossible_status.get()
                 self.impossible_status.set(f"Invalid action -> {direction}"); 
-                self.root.update(); time.sleep(0.5)
-                self.impossible_status.set(prior_status)
+                self.root.after(STATUS_MS, lambda: self.impossible_status.set(prior_status))
                 return        
             
         # Permit user to use the animation buttons now & choose animation speed
         for tkobj in [self.toEndButton, self.nextButton, self.playButton]:
             tkobj.config(state=tk.NORMAL)
 
-    def perform_next_direction(self) -> None:
+    def load_session(self) -> None:
+        """
+            Ask for a recorded session of this warehouse, and play it back like a
+            sequence of moves (undos included). The session is decoded lazily as it plays.
+        """
+        path = filedialog.askopenfilename(
+            parent=self.root, initialdir=os.path.dirname(self.path), title="Load session",
+            filetypes=[("Recorded sessions", f"*{SESSION_EXT}")])
+        if not path: return
+        try: session = Session.load(path)
+        except (OSError, ValueError): 
+            self.impossible_status.set("Unable to load the session.")
+            return
+        self.moves, self.moves_index = [], 0
+        self.playback = (event for _, event in session.events())
+        if not session.matches(self.path): self.status.set("Session was recorded on another version of this warehouse.")
+        for tkobj in [self.toEndButton, self.nextButton, self.playButton]:
+            tkobj.config(state=tk.NORMAL)
+
+    def save_session(self, quiet=False) -> None:
+        """ Save the recorded manual session next to the warehouse. """
+        try: path = self.recorder.save()
+        except OSError: path = None
+        if not quiet: self.status.set(f"Saved {os.path.basename(path)}." if path else "Nothing to save.")
+
+    def perform_next_direction(self) -> bool:
         """ 
             Moves the player tile (and any other effected tile)
-            according to the direction found by indexing the moves list
-            by the moves index.
+            according to the next direction (or undo) being played back.
             Moves index is then updated to the next index.
+            Return false once there is nothing left to play.
         """
-        self.key_event(self.moves[self.moves_index])
+        event = next(self.playback, None)
+        if event == None: return False
+        if event == UNDO: self.undo_event()
+        else: self.key_event(event)
         self.moves_index += 1
+        return True
 
     def play_pause(self) -> None:
         """ 
@@ -189,38 +323,57 @@ class Sequence:
             If the animation is in a state of 'Play', user can toggle the play button
             to interrupt or pause the animation.
 
-            Use threading to play the animation and allow state of the animation player
-            to interupt the animation loop.
+            Each move is scheduled on the event loop (no threads), 
+            so pausing only has to cancel the next scheduled move.
         """
-        status = self.player_status.get()
-        if status == "Play": 
-            t = threading.Thread(
-                target=lambda: self.animate_directions(sleep=True, conditional=True), daemon=True
-            ).start()
-        self.player_status.set("Pause" if status == "Play" else "Play")
+        if self.player_status.get() == "Play": 
+            self.player_status.set("Pause")
+            self.playButton.config(text=f"{self.player_status.get()} ⏯️")
+            self.play_job = self.root.after(int(self.sleep.get() * 20), self.play_step)
+        else: self.stop_playing()
+
+    def play_step(self) -> None:
+        """ Play one move, then schedule the next one after the sleep time. """
+        self.play_job = None
+        if not self.perform_next_direction() or self.deadlock_stop(): return self.stop_playing()
+        self.play_job = self.root.after(int(self.sleep.get() * 20), self.play_step)
+
+    def stop_playing(self) -> None:
+        if self.play_job != None: self.root.after_cancel(self.play_job)
+        self.play_job = None
+        self.player_status.set("Play")
         self.playButton.config(text=f"{self.player_status.get()} ⏯️")
 
-    def animate_directions(self, sleep=False, conditional=False) -> None:
+    def deadlock_stop(self) -> bool:
+        return self.stop_at_deadlock.get() and bool(self.board.last_deadlocks)
+
+    def animate_directions(self) -> None:
         """
-            Iterates over the list of moves until finished or interrupted.
-            A sleep parameter can be provided for the amount of time to rest in
-            between moves. A conditional parameter can be provided as an option
-            to break out of the animation if the play button is set to pause.
-
-            By default, the sleep is set False, and there is no interruption clause.
-            This means that by default, this function graphically appears to skip to 
-            the end after all moves have been taken by the player.
+            Iterates over the rest of the moves until finished (or stopped at a deadlock),
+            which graphically appears to skip to the end.
+        """
+        self.stop_playing()
+        while self.perform_next_direction():
+            if self.deadlock_stop(): break
+
+    def close(self) -> None:
+        """ Stop any playback and save the recorded session, called by the window manager on close. """
+        self.stop_playing()
+        self.save_session(quiet=True)
+
+    def register_moves(self) -> None:
+        """ 
+            Register the current moves under a name, so that the fixture
+            export pipeline computes their final state for this warehouse.
         """
-        while (self.moves_index < len(self.moves)):
-            if sleep: time.sleep(self.sleep.get()/50)
-            if (conditional and self.player_status.get() != "Pause"): break
-            self.perform_next_direction()
+        name = simpledialog.askstring("Register Moves", "Enter a name for these moves: ", parent=self.root)
+        if not name: return
+        register_sequence(os.path.dirname(self.path), os.path.basename(self.path), name, self.moves)
+        self.status.set(f"Registered as {name}.")
 
     def to_clipboard(self, text: str) -> None:
         """ Clear user clipboard and replace with requested text. """
         self.status.set("Copied!")
         self.root.clipboard_clear()
         self.root.clipboard_append(text)
-        self.root.update()
-        time.sleep(0.5)
-        self.status.set("")
\ No newline at end of file
+        self.root.after(STATUS_MS, lambda: self.status.set(""))
\ No newline at end of file
@@ -1,7 +1,6 @@
 import tkinter as tk
-import time
 from components.board import Board 
-from components.globals import H1, BUTTONS, TABOO
+from components.globals import H1, BUTTONS, TABOO, STATUS_MS
 
 class Taboo:
     """ 
@@ -17,7 +16,6 @@ class Taboo:
         wh_name = (path.split('/')[-1]).split('.txt')[0]
         tk.Label(self.root, text=f"Taboo Cell Finder for {wh_name}", font=H1).pack(side=tk.TOP, pady=10)
         self.set_content()
-        self.root.mainloop()
 
     def set_content(self) -> None:
         """ 
@@ -41,6 +39,4 @@ class Taboo:
         self.status.set("Copied!")
         self.root.clipboard_clear()
         self.root.clipboard_append(self.board.__repr__())
-        self.root.update()
-        time.sleep(0.5)
-        self.status.set("")
\ No newline at end of file
+        self.root.after(STATUS_MS, lambda: self.status.set(""))
\ No newline at end of file
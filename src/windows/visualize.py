@@ -1,14 +1,23 @@
 import tkinter as tk
 from components.board import Board 
 from components.globals import H1
+from windows.reload import Reloadable
 
-class Visualize:
+class Visualize(Reloadable):
     """ Lets users graphically view a Sokoban warehouse. """
     def __init__(self, root: tk.Tk, path: str) -> None:
         self.root = root
+        self.path = path
         self.root.focus_force()
         self.root.title("SKBN - Visualizer Tool")
         wh_name = (path.split('/')[-1]).split('.txt')[0]
         tk.Label(self.root, text="Viewing " + wh_name, font=H1).pack(side=tk.TOP, pady=10)
-        self.board = Board(self.root, path)
-        self.root.mainloop()
\ No newline at end of file
+        self.set_reload_bar(anchor=lambda: self.holder)
+        self.holder = tk.Frame(self.root); self.pack_holder(self.holder)
+        self.board = self.new_board(self.holder)
+
+    def new_board(self, holder: tk.Frame) -> Board:
+        return Board(holder, self.path)
+
+    def pack_holder(self, holder: tk.Frame) -> None:
+        holder.pack(side=tk.TOP)